@@ -6,25 +6,123 @@ Contains the WorkflowApp class which orchestrates the entire GUI.
 import tkinter as tk
 import tkinter.scrolledtext as scrolledtext
 from tkinter import ttk, messagebox, filedialog
-import json
-import yaml
+import heapq
+import re
 import uuid
 import threading
+import time
 import copy
 import os
+import queue
+import sys
 import logging
+from collections import Counter, deque
+from dataclasses import replace
+from functools import lru_cache, partial
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Optional
+from enum import IntFlag, auto
+from typing import Deque, Dict, List, Optional, Tuple
 from pathlib import Path
 
-from models import Workflow, WorkflowStep, ExecutionResult, StepStatus, UserInteraction
+import serialization
+from template_cache import TemplateCache
+from models import Workflow, WorkflowStep, ExecutionResult, StepStatus, UserInteraction, Theme
 from workflow_engine import WorkflowRunner, VariableResolver
 from gui.canvas import WorkflowCanvas
 from gui.editors import WorkflowEditor, TemplateEditor
 from gui.dialogs import TemplateManager, LoadingScreen, SettingsPanel
+from gui.help_text import HELP_TABS
 
 logger = logging.getLogger(__name__)
 
+USER_DATA_FILE = "user_data.json"
+INTERACTION_LOG_FILE = "user_data.log"  # Append-only, one JSON interaction per line
+LOG_WIDGET_MAX_LINES = 10_000  # Lines kept in the execution log widget
+LOG_HISTORY_LINES = 50_000  # Log messages kept in memory for export
+LOG_FLUSH_MS = 50  # Buffered log lines are written to the widget at most this often
+ANIMATION_PUMP_MS = 16  # Interval at which runner events are applied on the Tk thread
+LOAD_POLL_MS = 20  # Interval at which the Tk thread checks for the background load's results
+MAX_INTERACTIONS = 10_000  # Raw interactions kept in memory and in the compacted log
+RECENT_INTERACTIONS = 10  # Window of interactions used to guess the current context
+PREFERENCE_COUNTERS = ("frequently_used_steps", "frequently_used_templates", "preferred_tools", "ui_layout_preferences")
+
+# Node and connection colors applied on top of the base theme for each workflow context
+CONTEXT_COLOR_OVERLAYS = {
+    # Blue-themed colors for reconnaissance
+    "reconnaissance": {"node_pending": "#3A4A6A", "node_running": "#4A90E2", "node_success": "#3D6B4D", "conn_color": "#4A90E2"},
+    # Red-themed colors for exploitation
+    "exploitation": {"node_pending": "#7B4B4B", "node_running": "#D0021B", "node_success": "#3D6B4D", "conn_color": "#D0021B"},
+    # Green-themed colors for reporting
+    "reporting": {"node_pending": "#3D6B4D", "node_running": "#7ED321", "node_success": "#3D6B4D", "conn_color": "#7ED321"},
+}
+
+# Keyword classifiers. Each alternative is a lookahead over the whole string, so
+# a single match() honours the priority order of the groups (first group wins)
+# while keeping plain substring semantics.
+_ACTIVITY_RE = re.compile(
+    r"(?=.*?(?P<dns>dns|dig|nslookup))"
+    r"|(?=.*?(?P<http>http|curl|wget))"
+    r"|(?=.*?(?P<file>scp|rsync|ftp))",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONTEXT_RE = re.compile(
+    r"(?=.*?(?P<reconnaissance>subfinder|amass|dns|scan|enum|recon))"
+    r"|(?=.*?(?P<exploitation>exploit|payload|attack|vuln|nmap))"
+    r"|(?=.*?(?P<reporting>report|export|document|summary))",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@lru_cache(maxsize=512)
+def _classify_activity(command: str) -> str:
+    """Map a step command to the particle activity type (dns, http, file, generic)"""
+    match = _ACTIVITY_RE.match(command)
+    return match.lastgroup if match else "generic"
+
+
+def _write_yaml(path: str, data: Dict):
+    """Dump data to a YAML file, using libyaml's C emitter when PyYAML was built with it"""
+    import yaml  # Imported lazily; only YAML workflows need it
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with open(path, 'w') as f:
+        yaml.dump(data, f, Dumper=dumper, default_flow_style=False)
+
+
+class Dirty(IntFlag):
+    """Parts of the main window refreshed by update_workflow_display"""
+    NAME = auto()
+    DESC = auto()
+    VARS = auto()
+    NODES = auto()
+    EDGES = auto()
+    RECOMMENDATIONS = auto()
+    HEADER = NAME | DESC | VARS
+    GRAPH = NODES | EDGES | RECOMMENDATIONS  # Step changes can also change the context
+    ALL = HEADER | GRAPH
+
+
+def _parse_assignments(text: str) -> Dict[str, str]:
+    """Parse KEY=VALUE lines, ignoring lines without '='"""
+    result = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            result[key.strip()] = value.strip()
+    return result
+
+
+_NAVIGATION_KEYS = frozenset({"Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next"})
+
+
+def _read_only_key(event):
+    """Key binding that lets a Text widget be navigated and copied from but not edited"""
+    if event.keysym in _NAVIGATION_KEYS:
+        return None
+    if event.state & 0x4 and event.keysym.lower() in ("c", "a", "slash"):  # Control: copy / select all
+        return None
+    return "break"
+
 
 class WorkflowApp:
     """Main application window"""
@@ -39,35 +137,70 @@ class WorkflowApp:
         
         self.current_workflow = Workflow()
         self.runner = WorkflowRunner()
+        self.runner.set_status_callback(self.on_step_status_update)
+        self.runner.set_animation_callback(self.on_step_animation_update)
         self.selected_step_id: Optional[str] = None
         self.current_filepath: Optional[str] = None
         self.autosave_enabled = True
         self.animation_enabled = True  # Neural network animation feature
         self.animation_speed = 1.0  # Default animation speed
+        self._log_lines: Deque[str] = deque(maxlen=LOG_HISTORY_LINES)  # Execution log history, one message per entry
+        self._log_buf: Deque[str] = deque()  # Formatted lines waiting for the next flush
+        self._log_lock = threading.Lock()
+        self._log_flush_scheduled = False
+        self.async_execution = False  # Run parallel workflows on an asyncio event loop
+        self._debounced: Dict[str, tuple] = {}  # key -> (after id, callback)
+        self._last_global_vars: Tuple[Optional[str], Optional[Dict[str, str]]] = (None, None)  # (text, dict it produced)
+        self._ctx_cache: Tuple[Optional[tuple], str] = (None, "general")  # ((workflow, edit version, last interaction), context)
+        self._anim_q: "queue.Queue" = queue.Queue()  # (step_id, event, status) posted by the runner thread
+        self._anim_pump_id = None
+        self._run_thread: Optional[threading.Thread] = None
         
         # Adaptive Neural Interface features
-        self.user_interactions: List[UserInteraction] = []  # Track user interactions
+        self.user_interactions: Deque[UserInteraction] = deque(maxlen=MAX_INTERACTIONS)  # Track user interactions
+        self._recent_interactions: Deque[UserInteraction] = deque(maxlen=RECENT_INTERACTIONS)
+        self._recent_context_counts = Counter()  # Contexts of _recent_interactions
+        self._interactions_since_save = 0
         self.user_preferences = {}  # Store learned user preferences
+        self._interactions_fp = None  # Lazily opened handle on the interaction log
+        self._recommendation_cache: Dict[Optional[str], Dict[str, List]] = {}  # context (None = overall) -> top steps/templates
+        self._global_step_counter = Counter()  # Step usage summed over all contexts
+        self._global_template_counter = Counter()  # Template usage summed over all contexts
+        self._adapt_pending_id = None
+        self._applied_theme_key = None  # (theme, context) last passed through set_theme
         self.adaptive_interface_enabled = True  # Enable adaptive interface
+        self._user_data_loaded = False  # Set once the background loader has installed user data
+        self._pending_interactions = []  # Interactions tracked before that happened
+        self.templates: Dict[str, Workflow] = {}
         
         self.templates_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "templates")
-        if not os.path.exists(self.templates_dir):
+        try:
             os.makedirs(self.templates_dir)
+        except FileExistsError:
+            pass
+        else:
             self.create_default_template()
-
-        self.themes = {
-            "light": {
-                "bg": "#F0F0F0", "fg": "black", "widget_bg": "white", "widget_fg": "black",
-                "canvas_bg": "white", "node_pending": "lightblue", "node_running": "yellow",
-                "node_success": "lightgreen", "node_failed": "salmon", "node_skipped": "lightgrey",
-                "node_timeout": "orange", "node_outline": "blue", "node_text": "black", "conn_color": "blue",
-            },
-            "dark": {
-                "bg": "#2E2E2E", "fg": "#FFFFFF", "widget_bg": "#3C3C3C", "widget_fg": "#FFFFFF",
-                "canvas_bg": "#2E2E2E", "node_pending": "#3A4A6A", "node_running": "#A8A838",
-                "node_success": "#3D6B4D", "node_failed": "#7B4B4B", "node_skipped": "#555555",
-                "node_timeout": "#A96013", "node_outline": "#6A8EC3", "node_text": "white", "conn_color": "#6A8EC3",
-            }
+        self.template_cache = TemplateCache(self.templates_dir)
+
+        self.themes: Dict[str, Theme] = {
+            "light": Theme(
+                bg="#F0F0F0", fg="black", widget_bg="white", widget_fg="black",
+                canvas_bg="white", node_pending="lightblue", node_running="yellow",
+                node_success="lightgreen", node_failed="salmon", node_skipped="lightgrey",
+                node_timeout="orange", node_outline="blue", node_text="black", conn_color="blue",
+            ),
+            "dark": Theme(
+                bg="#2E2E2E", fg="#FFFFFF", widget_bg="#3C3C3C", widget_fg="#FFFFFF",
+                canvas_bg="#2E2E2E", node_pending="#3A4A6A", node_running="#A8A838",
+                node_success="#3D6B4D", node_failed="#7B4B4B", node_skipped="#555555",
+                node_timeout="#A96013", node_outline="#6A8EC3", node_text="white", conn_color="#6A8EC3",
+            )
+        }
+        # Each theme with the context-specific overlays already applied
+        self._theme_variants: Dict[Tuple[str, str], Theme] = {
+            (theme_name, context): replace(colors, **CONTEXT_COLOR_OVERLAYS.get(context, {}))
+            for theme_name, colors in self.themes.items()
+            for context in ("general", "reconnaissance", "exploitation", "reporting")
         }
         self.current_theme = "light"
         self.style = ttk.Style(self.root)
@@ -78,9 +211,21 @@ class WorkflowApp:
         self.last_saved_label = ttk.Label(self.root, text="", anchor=tk.W)
         self.last_saved_label.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
         self.autosave_id = None
+        self._dirty = False
+        self._autosave_pending_id = None
+        self._step_dict_cache: Dict[str, Dict] = {}  # step id -> serialized step
+        self._pending_dirty = Dirty(0)  # Display parts awaiting the idle-time refresh
+        self.autosave_debounce_ms = 500
 
+        self.root.protocol("WM_DELETE_WINDOW", self.quit_application)
         self.create_ui()
-        self.load_templates()
+        self._install_templates({}, None)
+        # Templates and user data are read while the loading screen is up. The worker only
+        # fills _load_q; the Tk thread picks the results up, since Tk may not be called
+        # from another thread before mainloop() starts
+        self._load_q: "queue.Queue" = queue.Queue(maxsize=1)
+        threading.Thread(target=self._background_load, daemon=True).start()
+        self.root.after(LOAD_POLL_MS, self._poll_loaded)
         self.set_theme("light")
         self.update_workflow_display()
         self.schedule_autosave()
@@ -102,37 +247,162 @@ class WorkflowApp:
 
     def load_settings(self):
         try:
-            with open("settings.json", 'r') as f:
-                settings = json.load(f)
+            with open("settings.json", 'rb') as f:
+                settings = serialization.loads(f.read())
                 self.current_theme = settings.get("theme", "light")
                 self.autosave_enabled = settings.get("autosave_enabled", True)
                 self.autosave_interval = settings.get("autosave_interval", 60000)
                 self.animation_enabled = settings.get("animation_enabled", True)
                 self.animation_speed = settings.get("animation_speed", 1.0)
+                self.async_execution = settings.get("async_execution", False)
                 self.adaptive_interface_enabled = settings.get("adaptive_interface_enabled", True)
-                self.user_preferences = settings.get("user_preferences", {})
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+                self._set_user_preferences(settings.get("user_preferences", {}))
+        except (FileNotFoundError, serialization.JSONDecodeError) as e:
             self.current_theme = "light"
             self.autosave_enabled = True
             self.autosave_interval = 60000
             self.show_warning("Settings Load Error", f"Could not load settings, using defaults: {e}")
-        
-        # Load user interaction data
-        self._load_user_data()
     
-    def _load_user_data(self):
-        """Load user interaction data from disk"""
+    def _read_user_data(self):
+        """Read preferences and the interaction log from disk.
+        
+        Runs on the background loader thread, so it only returns data and never touches app state.
+        Returns (preference snapshot or None, interactions, migrated_from_legacy).
+        """
+        snapshot = None
+        legacy_interactions = []
         try:
-            if os.path.exists("user_data.json"):
-                with open("user_data.json", 'r') as f:
-                    user_data = json.load(f)
-                    # Convert interaction data back to UserInteraction objects
-                    interaction_data = user_data.get("interactions", [])
-                    self.user_interactions = [UserInteraction(**data) for data in interaction_data]
-                    self.user_preferences = user_data.get("preferences", {})
+            if os.path.exists(USER_DATA_FILE):
+                user_data = serialization.read_json(USER_DATA_FILE)
+                snapshot = self._derive_preferences(user_data.get("preferences", {}))
+                # Older versions stored the full interaction history here
+                legacy_interactions = user_data.get("interactions", [])
         except Exception as e:
             logger.error(f"Failed to load user data: {e}")
 
+        interactions = deque((UserInteraction.from_dict(data) for data in legacy_interactions), maxlen=MAX_INTERACTIONS)
+        try:
+            if os.path.exists(INTERACTION_LOG_FILE):
+                with open(INTERACTION_LOG_FILE, 'rb') as f:
+                    for line in f:
+                        try:
+                            interactions.append(UserInteraction.from_dict(serialization.loads(line)))
+                        except (ValueError, TypeError):
+                            continue  # Skip a torn or malformed line
+        except Exception as e:
+            logger.error(f"Failed to load interaction log: {e}")
+        return snapshot, interactions, bool(legacy_interactions)
+
+    def _install_user_data(self, snapshot, interactions, migrated: bool):
+        """Install user data read by _read_user_data (Tk thread only)"""
+        if snapshot is not None:
+            self._install_preferences(snapshot)
+        self.user_interactions = interactions
+        self._recent_interactions = deque(interactions, maxlen=RECENT_INTERACTIONS)  # Keeps only the newest
+        self._recent_context_counts = Counter(i.context for i in self._recent_interactions)
+        self._user_data_loaded = True
+
+        if migrated:
+            # Move the history into the log so user_data.json only holds preferences
+            self._compact_interaction_log()
+            self._save_user_data()
+
+        # Replay anything tracked while the loader was still running
+        pending, self._pending_interactions = self._pending_interactions, []
+        for args in pending:
+            self.track_user_interaction(*args)
+
+    @staticmethod
+    def _derive_preferences(preferences: Dict) -> Dict:
+        """Turn the frequency tables loaded from JSON back into Counters and compute
+        the cross-context totals. Returns a snapshot for _install_preferences."""
+        # Older versions persisted a precomputed top-N here; it is now derived on demand
+        preferences.pop("recommendations", None)
+        global_steps = Counter()
+        global_templates = Counter()
+        for context_prefs in preferences.values():
+            if not isinstance(context_prefs, dict):
+                continue
+            for key in PREFERENCE_COUNTERS:
+                context_prefs[key] = Counter(context_prefs.get(key, {}))
+            global_steps.update(context_prefs["frequently_used_steps"])
+            global_templates.update(context_prefs["frequently_used_templates"])
+        return {"preferences": preferences, "global_steps": global_steps, "global_templates": global_templates}
+
+    def _install_preferences(self, snapshot: Dict):
+        self.user_preferences = snapshot["preferences"]
+        self._global_step_counter = snapshot["global_steps"]
+        self._global_template_counter = snapshot["global_templates"]
+        self._recommendation_cache.clear()
+
+    def _set_user_preferences(self, preferences: Dict):
+        """Install preferences loaded from JSON"""
+        self._install_preferences(self._derive_preferences(preferences))
+
+    def _background_load(self):
+        """Parse templates and user data off the Tk thread, then hand the results back.
+        
+        Each half fails on its own; a failure still hands back empty data plus a message,
+        so the Tk thread always installs something and reports the error.
+        """
+        try:
+            template_data = self.template_cache.load_all()
+        except Exception as e:
+            template_data = ({}, f"Failed to load templates: {e}")
+        user_error = None
+        try:
+            user_data = self._read_user_data()
+        except Exception as e:
+            user_data = (None, deque(maxlen=MAX_INTERACTIONS), False)
+            user_error = f"Failed to load user data: {e}"
+        self._load_q.put((template_data, user_data, user_error))
+
+    def _poll_loaded(self):
+        """Install the background load's results once they are ready (Tk thread only)"""
+        try:
+            loaded = self._load_q.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self._poll_loaded)
+            return
+        self._install_loaded(*loaded)
+
+    def _install_loaded(self, template_data, user_data, user_error: Optional[str]):
+        self._install_templates(*template_data)
+        self._install_user_data(*user_data)
+        self.update_workflow_display(Dirty.RECOMMENDATIONS)
+        if user_error:
+            self.show_error("User Data Load Error", user_error)
+
+    def _append_interaction(self, interaction: UserInteraction):
+        """Append a single interaction to the on-disk log"""
+        try:
+            if self._interactions_fp is None:
+                self._interactions_fp = open(INTERACTION_LOG_FILE, 'ab', buffering=8192)
+            self._interactions_fp.write(serialization.dumps(interaction.as_dict()) + b"\n")
+        except Exception as e:
+            logger.error(f"Failed to append interaction: {e}")
+
+    def _compact_interaction_log(self):
+        """Rewrite the interaction log from memory, dropping any malformed lines"""
+        if self._interactions_fp is not None:
+            self._interactions_fp.close()
+            self._interactions_fp = None
+        tmp_path = INTERACTION_LOG_FILE + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for interaction in self.user_interactions:
+                    f.write(serialization.dumps(interaction.as_dict()) + b"\n")
+            os.replace(tmp_path, INTERACTION_LOG_FILE)
+        except Exception as e:
+            logger.error(f"Failed to compact interaction log: {e}")
+
+    def _shutdown_user_data(self):
+        """Persist preferences and compact the interaction log before exit"""
+        if not self._user_data_loaded:
+            return  # Nothing was loaded yet, so writing now would clobber the files
+        self._compact_interaction_log()
+        self._save_user_data()
+
     def save_settings(self):
         settings = {
             "theme": self.current_theme,
@@ -140,12 +410,13 @@ class WorkflowApp:
             "autosave_interval": self.autosave_interval,
             "animation_enabled": self.animation_enabled,
             "animation_speed": self.animation_speed,
+            "async_execution": self.async_execution,
             "adaptive_interface_enabled": self.adaptive_interface_enabled,
             "user_preferences": self.user_preferences
         }
         try:
-            with open("settings.json", 'w') as f:
-                json.dump(settings, f, indent=2)
+            with open("settings.json", 'wb') as f:
+                f.write(serialization.dumps(settings, indent=True))
         except Exception as e:
             self.show_error("Settings Save Error", f"Failed to save settings: {e}")
     
@@ -153,9 +424,12 @@ class WorkflowApp:
         """Track a user interaction for adaptive interface learning"""
         if not self.adaptive_interface_enabled:
             return
+        if not self._user_data_loaded:
+            self._pending_interactions.append((action, target, context, duration))
+            return
             
         interaction = UserInteraction(
-            timestamp=datetime.now().isoformat(),
+            timestamp=time.time_ns() // 1_000_000,
             action=action,
             target=target,
             context=context,
@@ -165,14 +439,30 @@ class WorkflowApp:
         
         # Update user preferences based on interactions
         self._update_user_preferences(interaction)
+        self._remember_recent(interaction)
+        self._append_interaction(interaction)
         
-        # Adapt interface based on context changes
-        self._adapt_interface_to_context()
+        # Adapt interface based on context changes, at most once per second
+        if not self._adapt_pending_id:
+            self._adapt_pending_id = self.root.after(1000, self._do_adapt)
         
-        # Save interactions periodically
-        if len(self.user_interactions) % 10 == 0:
+        # Save preferences periodically
+        self._interactions_since_save += 1
+        if self._interactions_since_save >= 10:
             self._save_user_data()
     
+    def _remember_recent(self, interaction: UserInteraction):
+        """Add an interaction to the recent window, keeping the per-context tally in step"""
+        recent = self._recent_interactions
+        if len(recent) == recent.maxlen:
+            self._recent_context_counts[recent[0].context] -= 1
+        recent.append(interaction)
+        self._recent_context_counts[interaction.context] += 1
+
+    def _do_adapt(self):
+        self._adapt_pending_id = None
+        self._adapt_interface_to_context()
+
     def _adapt_interface_to_context(self):
         """Adapt the interface based on the current context"""
         if not self.adaptive_interface_enabled:
@@ -181,7 +471,7 @@ class WorkflowApp:
         # Determine current context
         current_context = self._determine_current_context()
         
-        # Re-apply theme to adapt colors
+        # Re-apply theme to adapt colors; set_theme is a no-op if the context colors would not change
         self.set_theme(self.current_theme)
         
         # Rearrange UI elements based on usage patterns
@@ -199,52 +489,58 @@ class WorkflowApp:
         if not self.adaptive_interface_enabled:
             return
             
-        # Clear existing content
-        for widget in self.recommendations_frame.winfo_children():
-            widget.destroy()
-        
         # Get recommendations
         recommendations = self.get_user_recommendations(context)
+        step_recs = recommendations["steps"][:len(self._rec_step_buttons)]  # Top 3
+        template_recs = recommendations["templates"][:len(self._rec_template_buttons)]  # Top 2
         
-        # Create UI elements for recommendations
-        if recommendations["steps"] or recommendations["templates"]:
-            # Create a frame for steps
-            if recommendations["steps"]:
-                steps_label = ttk.Label(self.recommendations_frame, text="Suggested Steps:", font=("TkDefaultFont", 9, "bold"))
-                steps_label.pack(anchor=tk.W, padx=5, pady=(5, 0))
-                
-                for step_name, count in recommendations["steps"][:3]:  # Top 3
-                    step_btn = ttk.Button(
-                        self.recommendations_frame, 
-                        text=f"{step_name} ({count} uses)",
-                        command=lambda name=step_name: self._add_recommended_step(name),
-                        width=30
-                    )
-                    step_btn.pack(fill=tk.X, padx=5, pady=2)
+        # Skip the relayout if nothing visible would change
+        panel_state = (tuple(map(tuple, step_recs)), tuple(map(tuple, template_recs)))
+        if panel_state == self._rec_panel_state:
+            return
+        self._rec_panel_state = panel_state
+        
+        # Hide everything, then repack only the slots in use so packing order is preserved
+        for widget in self.recommendations_frame.winfo_children():
+            widget.pack_forget()
+        
+        if step_recs or template_recs:
+            if step_recs:
+                self._rec_steps_label.pack(anchor=tk.W, padx=5, pady=(5, 0))
+                for btn, (step_name, count) in zip(self._rec_step_buttons, step_recs):
+                    btn.configure(text=f"{step_name} ({count} uses)",
+                                  command=partial(self._add_recommended_step, step_name))
+                    btn.pack(fill=tk.X, padx=5, pady=2)
             
-            # Create a frame for templates
-            if recommendations["templates"]:
-                templates_label = ttk.Label(self.recommendations_frame, text="Suggested Templates:", font=("TkDefaultFont", 9, "bold"))
-                templates_label.pack(anchor=tk.W, padx=5, pady=(10, 0))
-                
-                for template_name, count in recommendations["templates"][:2]:  # Top 2
-                    # Strip .json extension for display
-                    display_name = template_name.replace(".json", "") if template_name.endswith(".json") else template_name
-                    template_btn = ttk.Button(
-                        self.recommendations_frame, 
-                        text=f"{display_name} ({count} uses)",
-                        command=lambda name=template_name: self._load_recommended_template(name),
-                        width=30
-                    )
-                    template_btn.pack(fill=tk.X, padx=5, pady=2)
+            if template_recs:
+                self._rec_templates_label.pack(anchor=tk.W, padx=5, pady=(10, 0))
+                for btn, (template_name, count) in zip(self._rec_template_buttons, template_recs):
+                    display_name = self._template_display_name(template_name)
+                    btn.configure(text=f"{display_name} ({count} uses)",
+                                  command=partial(self._load_recommended_template, template_name))
+                    btn.pack(fill=tk.X, padx=5, pady=2)
         else:
             # Show a message when there are no recommendations yet
-            no_rec_label = ttk.Label(
-                self.recommendations_frame, 
-                text="Use the application to get personalized recommendations",
-                foreground="gray"
-            )
-            no_rec_label.pack(padx=5, pady=20)
+            self._rec_empty_label.pack(padx=5, pady=20)
+    
+    @staticmethod
+    def _template_display_name(template_name: str) -> str:
+        """Strip the .json extension from a template file name"""
+        return template_name.removesuffix(".json")
+    
+    def _create_recommendations_widgets(self):
+        """Create the fixed pool of widgets reused by the recommendations panel"""
+        frame = self.recommendations_frame
+        self._rec_steps_label = ttk.Label(frame, text="Suggested Steps:", font=("TkDefaultFont", 9, "bold"))
+        self._rec_step_buttons = [ttk.Button(frame, width=30) for _ in range(3)]
+        self._rec_templates_label = ttk.Label(frame, text="Suggested Templates:", font=("TkDefaultFont", 9, "bold"))
+        self._rec_template_buttons = [ttk.Button(frame, width=30) for _ in range(2)]
+        self._rec_empty_label = ttk.Label(
+            frame, 
+            text="Use the application to get personalized recommendations",
+            foreground="gray"
+        )
+        self._rec_panel_state = None
     
     def _add_recommended_step(self, step_name: str):
         """Add a recommended step to the current workflow"""
@@ -258,7 +554,8 @@ class WorkflowApp:
         
         if new_step.name:
             self.current_workflow.steps.append(new_step)
-            self.update_workflow_display()
+            self.mark_dirty()
+            self.request_display_update(Dirty.GRAPH)
             # Track this interaction
             self.track_user_interaction("step_added", new_step.name)
     
@@ -268,7 +565,7 @@ class WorkflowApp:
         self.track_user_interaction("ui_element_used", "recommended_template", "general")
         
         # Find and load the template
-        template = self.templates.get(template_name.replace(".json", "") if template_name.endswith(".json") else template_name)
+        template = self.templates.get(self._template_display_name(template_name))
         if template:
             self.load_template(template)
             # Track this interaction
@@ -287,9 +584,9 @@ class WorkflowApp:
         frequent_templates = context_prefs.get("frequently_used_templates", {})
         frequent_steps = context_prefs.get("frequently_used_steps", {})
         
-        # Sort by frequency of use
-        sorted_templates = sorted(frequent_templates.items(), key=lambda x: x[1], reverse=True)
-        sorted_steps = sorted(frequent_steps.items(), key=lambda x: x[1], reverse=True)
+        # Pick the most frequently used entries
+        sorted_templates = heapq.nlargest(3, frequent_templates.items(), key=itemgetter(1))
+        sorted_steps = heapq.nlargest(5, frequent_steps.items(), key=itemgetter(1))
         
         # For now, we'll just log this information
         # In a more advanced implementation, we could dynamically modify the UI
@@ -304,70 +601,35 @@ class WorkflowApp:
         """Update user preferences based on interactions"""
         # Initialize preference tracking if needed
         if interaction.context not in self.user_preferences:
-            self.user_preferences[interaction.context] = {
-                "frequently_used_steps": {},
-                "frequently_used_templates": {},
-                "preferred_tools": {},
-                "ui_layout_preferences": {}
-            }
+            self.user_preferences[interaction.context] = {key: Counter() for key in PREFERENCE_COUNTERS}
         
         context_prefs = self.user_preferences[interaction.context]
+        self._recommendation_cache.pop(interaction.context, None)
+        self._recommendation_cache.pop(None, None)
         
         # Track frequently used steps
         if interaction.action == "step_added" or interaction.action == "step_executed":
-            step_name = interaction.target
-            context_prefs["frequently_used_steps"][step_name] = context_prefs["frequently_used_steps"].get(step_name, 0) + 1
+            context_prefs["frequently_used_steps"][interaction.target] += 1
+            self._global_step_counter[interaction.target] += 1
         
         # Track frequently used templates
         if interaction.action == "template_used":
-            template_name = interaction.target
-            context_prefs["frequently_used_templates"][template_name] = context_prefs["frequently_used_templates"].get(template_name, 0) + 1
+            context_prefs["frequently_used_templates"][interaction.target] += 1
+            self._global_template_counter[interaction.target] += 1
             
         # Track UI element usage
         if interaction.action == "ui_element_used":
-            element_name = interaction.target
-            context_prefs["ui_layout_preferences"][element_name] = context_prefs["ui_layout_preferences"].get(element_name, 0) + 1
+            context_prefs["ui_layout_preferences"][interaction.target] += 1
             
         # Determine context from step names or commands
         self._infer_context_from_interaction(interaction)
-        
-        # Update predictive model
-        self._update_predictive_model()
-    
-    def _update_predictive_model(self):
-        """Simple predictive model based on frequency analysis"""
-        # This is a basic implementation that could be enhanced with more sophisticated ML
-        # For now, we'll just use frequency-based recommendations
-        
-        # Combine data from all contexts for overall preferences
-        overall_steps = {}
-        overall_templates = {}
-        
-        for context, prefs in self.user_preferences.items():
-            for step, count in prefs.get("frequently_used_steps", {}).items():
-                overall_steps[step] = overall_steps.get(step, 0) + count
-                
-            for template, count in prefs.get("frequently_used_templates", {}).items():
-                overall_templates[template] = overall_templates.get(template, 0) + count
-        
-        # Store top recommendations
-        self.user_preferences["recommendations"] = {
-            "steps": sorted(overall_steps.items(), key=lambda x: x[1], reverse=True)[:10],
-            "templates": sorted(overall_templates.items(), key=lambda x: x[1], reverse=True)[:5]
-        }
     
     def _infer_context_from_interaction(self, interaction: UserInteraction):
         """Infer the context (recon, exploit, report) from interaction details"""
-        target = interaction.target.lower()
-        action = interaction.action.lower()
-        
         # Determine context based on keywords
-        if any(keyword in target for keyword in ["subfinder", "amass", "dns", "scan", "enum", "recon"]):
-            interaction.context = "reconnaissance"
-        elif any(keyword in target for keyword in ["exploit", "payload", "attack", "vuln", "nmap"]):
-            interaction.context = "exploitation"
-        elif any(keyword in target for keyword in ["report", "export", "document", "summary"]):
-            interaction.context = "reporting"
+        match = _CONTEXT_RE.match(interaction.target)
+        if match:
+            interaction.context = match.lastgroup
     
     def get_user_recommendations(self, context: str = "general") -> Dict[str, List]:
         """Get recommendations for the user based on their interaction history"""
@@ -376,31 +638,38 @@ class WorkflowApp:
             
         # Get context-specific recommendations
         if context in self.user_preferences:
-            context_prefs = self.user_preferences[context]
-            steps = list(context_prefs.get("frequently_used_steps", {}).items())
-            templates = list(context_prefs.get("frequently_used_templates", {}).items())
+            cached = self._recommendation_cache.get(context)
+            if cached is not None:
+                return cached
             
-            # Sort by frequency
-            steps.sort(key=lambda x: x[1], reverse=True)
-            templates.sort(key=lambda x: x[1], reverse=True)
-            
-            return {
-                "steps": steps[:5],  # Top 5 steps
-                "templates": templates[:3]  # Top 3 templates
+            context_prefs = self.user_preferences[context]
+            recommendations = {
+                "steps": heapq.nlargest(5, context_prefs.get("frequently_used_steps", {}).items(), key=itemgetter(1)),  # Top 5 steps
+                "templates": heapq.nlargest(3, context_prefs.get("frequently_used_templates", {}).items(), key=itemgetter(1))  # Top 3 templates
             }
-        
-        # Fallback to general recommendations
-        return self.user_preferences.get("recommendations", {"steps": [], "templates": []})
+            self._recommendation_cache[context] = recommendations
+            return recommendations
+        
+        # Fallback to recommendations across all contexts
+        recommendations = self._recommendation_cache.get(None)
+        if recommendations is None:
+            recommendations = self._recommendation_cache[None] = {
+                "steps": heapq.nlargest(10, self._global_step_counter.items(), key=itemgetter(1)),
+                "templates": heapq.nlargest(5, self._global_template_counter.items(), key=itemgetter(1))
+            }
+        return recommendations
     
     def _save_user_data(self):
-        """Save user interaction data to disk"""
+        """Save user preferences to disk; interactions live in the append-only log"""
+        self._interactions_since_save = 0
         try:
+            if self._interactions_fp is not None:
+                self._interactions_fp.flush()
             user_data = {
-                "interactions": [asdict(interaction) for interaction in self.user_interactions],
                 "preferences": self.user_preferences
             }
-            with open("user_data.json", 'w') as f:
-                json.dump(user_data, f, indent=2)
+            serialization.write_json(USER_DATA_FILE, user_data, indent=True,
+                                     compress_over=serialization.COMPRESS_THRESHOLD)
         except Exception as e:
             logger.error(f"Failed to save user data: {e}")
 
@@ -422,8 +691,8 @@ class WorkflowApp:
         
         filepath = os.path.join(self.templates_dir, "subdomain_recon.json")
         try:
-            with open(filepath, 'w') as f:
-                json.dump(recon_workflow.to_dict(), f, indent=2)
+            with open(filepath, 'wb') as f:
+                f.write(serialization.dumps(recon_workflow.to_dict(), indent=True))
         except Exception as e:
             self.show_error("Template Creation Error", f"Failed to create default template: {e}")
 
@@ -496,6 +765,7 @@ class WorkflowApp:
         # Recommendations panel (adaptive interface)
         self.recommendations_frame = ttk.LabelFrame(right_frame, text="Recommendations")
         self.recommendations_frame.pack(fill=tk.X, padx=5, pady=5)
+        self._create_recommendations_widgets()
         self._update_recommendations_panel()
         
         exec_frame = ttk.LabelFrame(right_frame, text="Execution")
@@ -517,8 +787,12 @@ class WorkflowApp:
         log_frame = ttk.LabelFrame(right_frame, text="Execution Log")
         log_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        self.log_text = scrolledtext.ScrolledText(log_frame, state=tk.DISABLED, relief=tk.FLAT)
+        self.log_text = scrolledtext.ScrolledText(log_frame, relief=tk.FLAT)
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # The log stays writable so appends need no state toggling; user edits are swallowed instead
+        self.log_text.bind("<Key>", _read_only_key)
+        for event in ("<<Paste>>", "<<PasteSelection>>", "<<Cut>>", "<<Clear>>", "<<Undo>>", "<<Redo>>"):
+            self.log_text.bind(event, lambda e: "break")
 
     def schedule_autosave(self):
         if self.autosave_id:
@@ -527,54 +801,124 @@ class WorkflowApp:
             self.autosave_id = self.root.after(self.autosave_interval, self.autosave_workflow)
 
     def autosave_workflow(self):
-        if self.current_filepath:
-            try:
-                data = self.current_workflow.to_dict()
-                with open(self.current_filepath, 'w') as f:
-                    if self.current_filepath.endswith(('.yaml', '.yml')):
-                        yaml.dump(data, f, default_flow_style=False)
-                    else:
-                        json.dump(data, f, indent=2)
-                self.last_saved_label.config(text=f"Last saved: {datetime.now().strftime('%H:%M:%S')}")
-            except Exception as e:
-                logger.error(f"Autosave failed: {e}")
-                # We don't show an error dialog for autosave failures to avoid interrupting the user
+        # Safety net for edits that slipped past the debounced writer
+        if self._dirty:
+            self._write_autosave()
         self.schedule_autosave() # Reschedule the next autosave
+
+    def mark_dirty(self, *step_ids: str):
+        """Flag the workflow as modified and (re)start the debounced autosave timer.
+        
+        Pass the ids of any steps whose own fields changed so their cached
+        serialized form is rebuilt on the next save.
+        """
+        for step_id in step_ids:
+            self._step_dict_cache.pop(step_id, None)
+        self.current_workflow.touch()
+        self._dirty = True
+        if not self.autosave_enabled:
+            return
+        if self._autosave_pending_id:
+            self.root.after_cancel(self._autosave_pending_id)
+        self._autosave_pending_id = self.root.after(self.autosave_debounce_ms, self._debounced_save)
+
+    def _debounced_save(self):
+        self._autosave_pending_id = None
+        if self._dirty:
+            self._write_autosave()
+
+    def _write_autosave(self):
+        """Write the current workflow to its file and clear the dirty flag"""
+        if not self.current_filepath:
+            return
+        try:
+            data = self.current_workflow.to_dict(self._step_dict_cache)
+            if self.current_filepath.endswith(('.yaml', '.yml')):
+                _write_yaml(self.current_filepath, data)
+            else:
+                # Same format as an explicit save; only app-owned files are ever compressed
+                serialization.write_json(self.current_filepath, data, indent=True)
+            self._dirty = False
+            self.last_saved_label.config(text=f"Last saved: {datetime.now().strftime('%H:%M:%S')}")
+        except Exception as e:
+            logger.error(f"Autosave failed: {e}")
+            # We don't show an error dialog for autosave failures to avoid interrupting the user
+
+    def flush_autosave(self):
+        """Write any pending autosave immediately"""
+        self._flush_debounced()
+        if self._autosave_pending_id:
+            self.root.after_cancel(self._autosave_pending_id)
+            self._autosave_pending_id = None
+        if self._dirty and self.autosave_enabled:
+            self._write_autosave()
+
+    def quit_application(self):
+        """Flush pending writes and close the application"""
+        self.flush_autosave()
+        self._shutdown_user_data()
+        self.runner.close()
+        self.template_cache.close()
+        self.root.destroy()
     
-    def on_step_animation_update(self, step_id: str, event: str, status: Optional[StepStatus] = None):
-        """Callback to handle animation updates during workflow execution"""
+    def on_step_animation_update(self, step_id: str, event: str, status: Optional[str] = None):
+        """Callback to handle animation updates during workflow execution.
+        
+        Called from the runner thread, so it only queues the event for the Tk thread.
+        """
+        self._anim_q.put_nowait((step_id, event, status))
+
+    def _start_anim_pump(self):
+        """Start draining runner events on the Tk thread if not already doing so"""
+        if not self._anim_pump_id:
+            self._anim_pump_id = self.root.after(ANIMATION_PUMP_MS, self._drain_anim_queue)
+
+    def _drain_anim_queue(self):
+        """Apply queued runner events on the Tk thread, keeping only the latest per step and event"""
+        pending = {}
+        try:
+            while True:
+                step_id, event, status = self._anim_q.get_nowait()
+                pending[(step_id, event)] = status
+        except queue.Empty:
+            pass
+        
+        for (step_id, event), status in pending.items():
+            if event == "status":
+                self.canvas.update_node_status(step_id, status)
+            else:
+                self._apply_animation_update(step_id, event, status)
+        
+        # Keep pumping while a run is in flight or events are still arriving
+        if (self._run_thread and self._run_thread.is_alive()) or not self._anim_q.empty():
+            self._anim_pump_id = self.root.after(ANIMATION_PUMP_MS, self._drain_anim_queue)
+        else:
+            self._anim_pump_id = None
+
+    def _apply_animation_update(self, step_id: str, event: str, status: Optional[str] = None):
+        """Spawn particles for a runner animation event (Tk thread only)"""
         if not self.animation_enabled:
             return
             
         # Start animation when step begins
         if event == "start":
             # Find all connections leading to this step
-            step = next((s for s in self.current_workflow.steps if s.id == step_id), None)
+            step = self.current_workflow.step_by_id(step_id)
             if step and self.canvas:
                 # Track this interaction
                 self.track_user_interaction("step_executed", step.name)
                 
-                # Create particles for each dependency connection
+                # Collect a particle for each dependency connection and create them together
+                batch = []
                 for dep_id in step.dependencies:
-                    # Find the connection line
-                    for conn_id in self.canvas.connections:
-                        tags = self.canvas.gettags(conn_id)
-                        if f"conn-from-{dep_id}" in tags and f"conn-to-{step_id}" in tags:
-                            # Determine activity type based on step command
-                            dep_step = next((s for s in self.current_workflow.steps if s.id == dep_id), None)
-                            activity_type = "generic"
-                            if dep_step:
-                                command = dep_step.command.lower()
-                                if "dns" in command or "dig" in command or "nslookup" in command:
-                                    activity_type = "dns"
-                                elif "http" in command or "curl" in command or "wget" in command:
-                                    activity_type = "http"
-                                elif "scp" in command or "rsync" in command or "ftp" in command:
-                                    activity_type = "file"
-                            
-                            # Create a particle for this connection
-                            self.canvas.create_particle(conn_id, activity_type)
-                            break
+                    conn_id = self.canvas.conns_by_endpoints.get((dep_id, step_id))
+                    if conn_id is None:
+                        continue
+                    # Determine activity type based on step command
+                    dep_step = self.current_workflow.step_by_id(dep_id)
+                    batch.append((conn_id, _classify_activity(dep_step.command) if dep_step else "generic"))
+                if batch:
+                    self.canvas.create_particles(batch)
         
         # Handle completion if needed
         elif event == "complete" and status:
@@ -595,15 +939,15 @@ class WorkflowApp:
         file_menu.add_separator()
         file_menu.add_command(label="Export Execution Log...", command=self.export_execution_log)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.quit_application)
         
         self.templates_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Templates", menu=self.templates_menu)
         
         theme_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Theme", menu=theme_menu)
-        theme_menu.add_command(label="Light Mode", command=lambda: self.set_theme("light"))
-        theme_menu.add_command(label="Dark Mode", command=lambda: self.set_theme("dark"))
+        theme_menu.add_command(label="Light Mode", command=partial(self.set_theme, "light"))
+        theme_menu.add_command(label="Dark Mode", command=partial(self.set_theme, "dark"))
 
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Settings", menu=settings_menu)
@@ -616,24 +960,19 @@ class WorkflowApp:
 
     def load_templates(self):
         """Load templates from the templates directory and update the menu."""
-        self.templates = {}
+        self._install_templates(*self.template_cache.load_all())
+
+    def _install_templates(self, templates: Dict[str, Workflow], error: Optional[str]):
+        """Store parsed templates and rebuild the Templates menu (Tk thread only)"""
+        self.templates = templates
         self.templates_menu.delete(0, tk.END)
-        
-        try:
-            for filename in sorted(os.listdir(self.templates_dir)):
-                if filename.endswith(".json"):
-                    filepath = os.path.join(self.templates_dir, filename)
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        workflow = Workflow.from_dict(data)
-                        self.templates[workflow.name] = workflow
-        except Exception as e:
-            self.show_error("Template Load Error", f"Failed to load templates: {e}")
+        if error:
+            self.show_error("Template Load Error", error)
 
-        for name, template in self.templates.items():
+        for name in self.templates:
             self.templates_menu.add_command(
                 label=name,
-                command=lambda t=template: self.load_template(t)
+                command=partial(self._dispatch_load_template, name)
             )
         
         if self.templates:
@@ -641,6 +980,12 @@ class WorkflowApp:
             
         self.templates_menu.add_command(label="Manage Templates...", command=self.open_template_manager)
 
+    def _dispatch_load_template(self, name: str):
+        """Templates menu command; looks the template up by name so reloads need no menu rebuild"""
+        template = self.templates.get(name)
+        if template:
+            self.load_template(template)
+
     def open_template_manager(self):
         TemplateManager(self.root, self)
 
@@ -653,10 +998,11 @@ class WorkflowApp:
             parent=self.root
         )
         if filename:
+            self._flush_log()
             try:
-                log_content = self.log_text.get("1.0", tk.END)
-                with open(filename, 'w') as f:
-                    f.write(log_content)
+                # Export the in-memory history, which also covers lines trimmed from the widget
+                with open(filename, 'w', buffering=1 << 20) as f:
+                    f.writelines(self._log_lines)
                 self.show_info("Success", "Execution log exported successfully")
             except Exception as e:
                 self.show_error("Export Error", f"Failed to export log: {e}")
@@ -667,73 +1013,70 @@ class WorkflowApp:
     def set_theme(self, theme_name: str):
         if theme_name not in self.themes: return
         self.current_theme = theme_name
-        colors = self.themes[theme_name].copy()  # Create a copy to modify
         
         # Adapt colors based on current context
         current_context = self._determine_current_context()
-        if current_context == "reconnaissance":
-            # Blue-themed colors for reconnaissance
-            colors["node_pending"] = "#3A4A6A"
-            colors["node_running"] = "#4A90E2"
-            colors["node_success"] = "#3D6B4D"
-            colors["conn_color"] = "#4A90E2"
-        elif current_context == "exploitation":
-            # Red-themed colors for exploitation
-            colors["node_pending"] = "#7B4B4B"
-            colors["node_running"] = "#D0021B"
-            colors["node_success"] = "#3D6B4D"
-            colors["conn_color"] = "#D0021B"
-        elif current_context == "reporting":
-            # Green-themed colors for reporting
-            colors["node_pending"] = "#3D6B4D"
-            colors["node_running"] = "#7ED321"
-            colors["node_success"] = "#3D6B4D"
-            colors["conn_color"] = "#7ED321"
-        
-        self.root.config(bg=colors["bg"])
+        key = (theme_name, current_context)
+        if key == self._applied_theme_key:
+            return
+        self._applied_theme_key = key
+        colors = self._theme_variants[key]
+        bg, fg = colors.bg, colors.fg
+        widget_bg, widget_fg = colors.widget_bg, colors.widget_fg
+        
+        self.root.config(bg=bg)
         self.style.theme_use('default')
-        self.style.configure('.', background=colors["bg"], foreground=colors["fg"], fieldbackground=colors["widget_bg"], troughcolor=colors["bg"])
-        self.style.map('.', background=[('active', colors["widget_bg"])] , foreground=[('active', colors["fg"])] )
+        self.style.configure('.', background=bg, foreground=fg, fieldbackground=widget_bg, troughcolor=bg)
+        self.style.map('.', background=[('active', widget_bg)] , foreground=[('active', fg)] )
         for style_name in ['TFrame', 'TLabel', 'TLabelFrame', 'TLabelFrame.Label', 'TCheckbutton']:
-            self.style.configure(style_name, background=colors["bg"], foreground=colors["fg"])
-        self.style.configure('TButton', background=colors["widget_bg"], foreground=colors["fg"], borderwidth=1)
-        self.style.map('TButton', background=[('active', colors["bg"])] , foreground=[('active', colors["fg"])] )
-        self.style.configure('TEntry', fieldbackground=colors["widget_bg"], foreground=colors["widget_fg"], insertcolor=colors["fg"])
-        self.style.configure('TNotebook', background=colors["bg"])
-        self.style.configure('TNotebook.Tab', background=colors["widget_bg"], foreground=colors["fg"])
-        self.style.map('TNotebook.Tab', background=[('selected', colors["bg"])] , foreground=[('selected', colors["fg"])] )
+            self.style.configure(style_name, background=bg, foreground=fg)
+        self.style.configure('TButton', background=widget_bg, foreground=fg, borderwidth=1)
+        self.style.map('TButton', background=[('active', bg)] , foreground=[('active', fg)] )
+        self.style.configure('TEntry', fieldbackground=widget_bg, foreground=widget_fg, insertcolor=fg)
+        self.style.configure('TNotebook', background=bg)
+        self.style.configure('TNotebook.Tab', background=widget_bg, foreground=fg)
+        self.style.map('TNotebook.Tab', background=[('selected', bg)] , foreground=[('selected', fg)] )
+        self.style.configure('Treeview', background=widget_bg, fieldbackground=widget_bg, foreground=widget_fg)
         for widget in [self.variables_text, self.log_text]:
-            widget.config(bg=colors["widget_bg"], fg=colors["widget_fg"], insertbackground=colors["fg"],
-                          selectbackground=colors["fg"], selectforeground=colors["bg"])
-        self.canvas.config(bg=colors["canvas_bg"])
-        self.update_workflow_display()
+            widget.config(bg=widget_bg, fg=widget_fg, insertbackground=fg,
+                          selectbackground=fg, selectforeground=bg)
+        self.canvas.refresh_theme()
+        self.canvas.config(bg=colors.canvas_bg)
+        self.update_workflow_display(Dirty.GRAPH)
     
     def _determine_current_context(self) -> str:
         """Determine the current context based on workflow content and user preferences"""
-        # First, check the current workflow for context clues
-        if self.current_workflow:
+        workflow = self.current_workflow
+        last_interaction = self.user_interactions[-1] if self.user_interactions else None
+        
+        # Reuse the last result until the workflow is edited or replaced, or a new interaction arrives
+        version = workflow.edit_version if workflow else None
+        cached_key, context = self._ctx_cache
+        if (cached_key is not None and cached_key[0] is workflow and cached_key[1] == version
+                and cached_key[2] is last_interaction):
+            return context
+        
+        workflow_text = ""
+        if workflow:
             # Look for keywords in workflow name and step names
-            workflow_text = (self.current_workflow.name + " " + 
-                           " ".join([step.name for step in self.current_workflow.steps])).lower()
-            
-            if any(keyword in workflow_text for keyword in ["subfinder", "amass", "dns", "scan", "enum", "recon"]):
-                return "reconnaissance"
-            elif any(keyword in workflow_text for keyword in ["exploit", "payload", "attack", "vuln", "nmap"]):
-                return "exploitation"
-            elif any(keyword in workflow_text for keyword in ["report", "export", "document", "summary"]):
-                return "reporting"
+            workflow_text = " ".join([workflow.name] + [step.name for step in workflow.steps])
+        context = self._compute_current_context(workflow_text)
+        self._ctx_cache = ((workflow, version, last_interaction), context)
+        return context
+
+    def _compute_current_context(self, workflow_text: str) -> str:
+        # First, check the current workflow for context clues
+        match = _CONTEXT_RE.match(workflow_text)
+        if match:
+            return match.lastgroup
         
         # If no clear context from workflow, use recent user interactions
-        recent_interactions = self.user_interactions[-10:]  # Last 10 interactions
-        context_counts = {"reconnaissance": 0, "exploitation": 0, "reporting": 0}
-        
-        for interaction in recent_interactions:
-            if interaction.context in context_counts:
-                context_counts[interaction.context] += 1
+        context_counts = self._recent_context_counts
         
         # Return the most frequent context
-        if max(context_counts.values()) > 0:
-            return max(context_counts, key=context_counts.get)
+        best = max(("reconnaissance", "exploitation", "reporting"), key=context_counts.__getitem__)
+        if context_counts[best] > 0:
+            return best
         
         # Default to general context
         return "general"
@@ -750,305 +1093,21 @@ class WorkflowApp:
         
         # Apply theme colors
         colors = self.themes[self.current_theme]
-        help_window.configure(bg=colors["bg"])
+        help_window.configure(bg=colors.bg)
         
         # Create a notebook for tabbed interface
         notebook = ttk.Notebook(help_window)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Style for text widgets
-        text_bg = colors["widget_bg"]
-        text_fg = colors["widget_fg"]
-        
-        # TAB 1: Overview
-        overview_frame = ttk.Frame(notebook)
-        notebook.add(overview_frame, text="Overview")
-        
-        overview_text = scrolledtext.ScrolledText(overview_frame, wrap=tk.WORD, bg=text_bg, fg=text_fg, 
-                                                 insertbackground=text_fg)
-        overview_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        overview_content = """
-Workflow Structure
-==================
-
-A workflow is a JSON object that defines a sequence of steps to execute. Each workflow consists of:
-
-• Metadata (name, description, author, etc.)
-• Global settings (execution mode, timeouts, environment variables)
-• A list of steps to execute
-
-Basic Workflow Structure:
-------------------------
-{
-  "name": "Workflow Name",
-  "description": "Brief description",
-  "version": "1.0",
-  "author": "Your Name",
-  "tags": ["tag1", "tag2"],
-  "execution_mode": "sequential",  // or "parallel"
-  "global_timeout": 3600,
-  "global_env_vars": {},
-  "steps": [...]
-}
-
-Key Concepts:
-------------
-1. Variables: Use {VARIABLE_NAME} syntax in commands
-2. Dependencies: Control execution order between steps
-3. Environment Variables: Set per-step or globally
-4. File Management: Define inputs and outputs for each step
-        """
-        overview_text.insert(tk.END, overview_content)
-        overview_text.config(state=tk.DISABLED)
-        
-        # TAB 2: Workflow Fields
-        workflow_frame = ttk.Frame(notebook)
-        notebook.add(workflow_frame, text="Workflow Fields")
-        
-        workflow_text = scrolledtext.ScrolledText(workflow_frame, wrap=tk.WORD, bg=text_bg, fg=text_fg, 
-                                                 insertbackground=text_fg)
-        workflow_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        workflow_content = """
-Workflow-Level Fields
-=====================
-
-Required Fields:
-----------------
-• name (string): The name of your workflow
-• steps (array): Array of step objects to execute
-
-Optional Fields:
-----------------
-• description (string): Detailed description of the workflow
-• version (string): Version number (default: "1.0")
-• author (string): Creator of the workflow
-• tags (array): List of tags for categorization
-• execution_mode (string): "sequential" or "parallel" (default: "sequential")
-• global_timeout (integer): Maximum execution time in seconds (default: 3600)
-• global_env_vars (object): Environment variables available to all steps
-• created_at (string): ISO timestamp (auto-generated)
-• modified_at (string): ISO timestamp (auto-generated)
-
-Example:
---------
-{
-  "name": "Subdomain Enumeration",
-  "description": "Discover subdomains using multiple tools",
-  "version": "1.0",
-  "author": "Security Team",
-  "tags": ["recon", "subdomain", "enumeration"],
-  "execution_mode": "sequential",
-  "global_timeout": 7200,
-  "global_env_vars": {
-    "TARGET": "example.com",
-    "OUTPUT_DIR": "/tmp/recon"
-  }
-}
-        """
-        workflow_text.insert(tk.END, workflow_content)
-        workflow_text.config(state=tk.DISABLED)
-        
-        # TAB 3: Step Fields
-        step_frame = ttk.Frame(notebook)
-        notebook.add(step_frame, text="Step Fields")
-        
-        step_text = scrolledtext.ScrolledText(step_frame, wrap=tk.WORD, bg=text_bg, fg=text_fg, 
-                                             insertbackground=text_fg)
-        step_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        step_content = """
-Step Object Fields
-==================
-
-Required Fields:
-----------------
-• name (string): Descriptive name for the step
-• command (string): Shell command to execute
-
-Optional Fields:
-----------------
-• id (string): Unique identifier (auto-generated if not provided)
-• description (string): Detailed explanation of what the step does
-• working_directory (string): Directory to execute the command in
-• environment_vars (object): Step-specific environment variables
-• input_files (array): List of file paths required by this step
-• output_files (array): List of file paths produced by this step
-• timeout (integer): Maximum execution time in seconds (default: 300)
-• retry_count (integer): Number of retry attempts on failure (default: 0)
-• dependencies (array): List of step IDs that must complete before this one
-• enabled (boolean): Whether to execute this step (default: true)
-• step_type (string): Type of step - "shell", "python", or "docker" (default: "shell")
-• custom_script (string): Custom code for python/docker steps
-• notes (string): Additional notes about the step
-• pos_x, pos_y (integers): Canvas position coordinates
-
-Example Step:
--------------
-{
-  "name": "Subfinder Scan",
-  "description": "Use subfinder to discover subdomains",
-  "command": "subfinder -d {TARGET} -o {OUTPUT_DIR}/subfinder.txt",
-  "working_directory": "{OUTPUT_DIR}",
-  "environment_vars": {
-    "SUBFINDER_TIMEOUT": "300"
-  },
-  "input_files": [],
-  "output_files": ["{OUTPUT_DIR}/subfinder.txt"],
-  "timeout": 600,
-  "retry_count": 1,
-  "dependencies": [],
-  "enabled": true,
-  "step_type": "shell",
-  "notes": "Requires subfinder to be installed"
-}
-        """
-        step_text.insert(tk.END, step_content)
-        step_text.config(state=tk.DISABLED)
-        
-        # TAB 4: Complete Example
-        example_frame = ttk.Frame(notebook)
-        notebook.add(example_frame, text="Complete Example")
-        
-        example_text = scrolledtext.ScrolledText(example_frame, wrap=tk.WORD, bg=text_bg, fg=text_fg, 
-                                                insertbackground=text_fg)
-        example_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        example_content = """
-Complete Workflow Example
-=========================
-
-{
-  "name": "Web Application Recon",
-  "description": "Comprehensive web application reconnaissance workflow",
-  "version": "1.0",
-  "author": "Bug Bounty Hunter",
-  "tags": ["web", "recon", "enumeration"],
-  "execution_mode": "sequential",
-  "global_timeout": 10800,
-  "global_env_vars": {
-    "TARGET": "example.com",
-    "OUTPUT_DIR": "/tmp/web_recon"
-  },
-  "steps": [
-    {
-      "id": "step1",
-      "name": "Subdomain Enumeration",
-      "description": "Discover subdomains using subfinder",
-      "command": "subfinder -d {TARGET} -o {OUTPUT_DIR}/subdomains.txt",
-      "working_directory": "{OUTPUT_DIR}",
-      "environment_vars": {},
-      "input_files": [],
-      "output_files": ["{OUTPUT_DIR}/subdomains.txt"],
-      "timeout": 600,
-      "retry_count": 1,
-      "dependencies": [],
-      "enabled": true,
-      "step_type": "shell",
-      "custom_script": "",
-      "notes": "Requires subfinder tool",
-      "pos_x": 50,
-      "pos_y": 50
-    },
-    {
-      "id": "step2",
-      "name": "HTTP Probing",
-      "description": "Check which subdomains are alive",
-      "command": "httpx -l {OUTPUT_DIR}/subdomains.txt -o {OUTPUT_DIR}/alive.txt",
-      "working_directory": "{OUTPUT_DIR}",
-      "environment_vars": {},
-      "input_files": ["{OUTPUT_DIR}/subdomains.txt"],
-      "output_files": ["{OUTPUT_DIR}/alive.txt"],
-      "timeout": 900,
-      "retry_count": 1,
-      "dependencies": ["step1"],
-      "enabled": true,
-      "step_type": "shell",
-      "custom_script": "",
-      "notes": "Requires httpx tool",
-      "pos_x": 300,
-      "pos_y": 50
-    },
-    {
-      "id": "step3",
-      "name": "Screenshot Capture",
-      "description": "Take screenshots of alive subdomains",
-      "command": "aquatone -hosts {OUTPUT_DIR}/alive.txt -out {OUTPUT_DIR}/aquatone",
-      "working_directory": "{OUTPUT_DIR}",
-      "environment_vars": {},
-      "input_files": ["{OUTPUT_DIR}/alive.txt"],
-      "output_files": ["{OUTPUT_DIR}/aquatone"],
-      "timeout": 1200,
-      "retry_count": 0,
-      "dependencies": ["step2"],
-      "enabled": true,
-      "step_type": "shell",
-      "custom_script": "",
-      "notes": "Requires aquatone tool",
-      "pos_x": 550,
-      "pos_y": 50
-    }
-  ]
-}
-        """
-        example_text.insert(tk.END, example_content)
-        example_text.config(state=tk.DISABLED)
-        
-        # TAB 5: Tips & Best Practices
-        tips_frame = ttk.Frame(notebook)
-        notebook.add(tips_frame, text="Tips & Best Practices")
-        
-        tips_text = scrolledtext.ScrolledText(tips_frame, wrap=tk.WORD, bg=text_bg, fg=text_fg, 
-                                             insertbackground=text_fg)
-        tips_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        tips_content = """
-Tips & Best Practices
-=====================
-
-1. Variable Usage:
-   • Use {VARIABLE_NAME} syntax for dynamic values
-   • Define global variables in global_env_vars
-   • Use step-specific variables in environment_vars
-
-2. Dependencies:
-   • Use step IDs in dependencies array
-   • Ensure no circular dependencies
-   • Sequential mode executes steps in order
-   • Parallel mode executes independent steps concurrently
-
-3. Error Handling:
-   • Set appropriate timeout values
-   • Use retry_count for flaky steps
-   • Disable experimental steps with enabled: false
-   • Add notes for troubleshooting
-
-4. File Management:
-   • Specify input_files for dependency tracking
-   • List output_files for cleanup/reference
-   • Use consistent directory structure
-
-5. Organization:
-   • Use descriptive names and descriptions
-   • Group related steps together
-   • Add tags for categorization
-   • Include version information
-
-6. Security:
-   • Avoid hardcoding sensitive information
-   • Use environment variables for secrets
-   • Validate file paths
-   • Limit working directories
-
-7. Testing:
-   • Use dry run feature to validate workflows
-   • Test with simple commands first
-   • Validate JSON syntax before saving
-   • Use templates for common workflows
-        """
-        tips_text.insert(tk.END, tips_content)
-        tips_text.config(state=tk.DISABLED)
+        for title, content in HELP_TABS:
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text=title)
+            
+            text = scrolledtext.ScrolledText(frame, wrap=tk.WORD, bg=colors.widget_bg, fg=colors.widget_fg,
+                                             insertbackground=colors.widget_fg)
+            text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+            text.insert("1.0", content)
+            text.config(state=tk.DISABLED)
         
         # Add a close button
         button_frame = ttk.Frame(help_window)
@@ -1057,45 +1116,99 @@ Tips & Best Practices
         close_btn = ttk.Button(button_frame, text="Close", command=help_window.destroy)
         close_btn.pack(side=tk.RIGHT)
 
+    def _debounce(self, key: str, ms: int, fn):
+        """Run fn once, ms after the last call with the same key"""
+        pending = self._debounced.pop(key, None)
+        if pending:
+            self.root.after_cancel(pending[0])
+        
+        def run():
+            self._debounced.pop(key, None)
+            fn()
+        self._debounced[key] = (self.root.after(ms, run), fn)
+
+    def _flush_debounced(self):
+        """Apply pending debounced edits immediately (e.g. before saving)"""
+        pending, self._debounced = self._debounced, {}
+        for after_id, fn in pending.values():
+            self.root.after_cancel(after_id)
+            fn()
+
     def on_workflow_name_changed(self, *args):
-        self.current_workflow.name = self.workflow_name_var.get()
+        self._debounce("name", 150, self._apply_workflow_name)
+
+    def _apply_workflow_name(self):
+        name = self.workflow_name_var.get()
+        if name != self.current_workflow.name:
+            self.current_workflow.name = name
+            self.mark_dirty()
     
     def on_workflow_desc_changed(self, *args):
-        self.current_workflow.description = self.workflow_desc_var.get()
+        self._debounce("description", 150, self._apply_workflow_desc)
+
+    def _apply_workflow_desc(self):
+        description = self.workflow_desc_var.get()
+        if description != self.current_workflow.description:
+            self.current_workflow.description = description
+            self.mark_dirty()
 
     def on_global_vars_changed(self, *args):
+        # <<Modified>> also fires when the flag is reset to False
+        if self.global_vars_text.edit_modified():
+            self._debounce("global_vars", 250, self._apply_global_vars)
+
+    def _apply_global_vars(self):
         try:
-            vars_text = self.global_vars_text.get("1.0", tk.END).strip()
-            if not vars_text:
-                self.current_workflow.global_env_vars = {}
+            vars_text = self.global_vars_text.get("1.0", tk.END)
+            # The modified event fires per keystroke; skip reparsing text that was already applied
+            last_text, last_vars = self._last_global_vars
+            if last_text == vars_text and last_vars is self.current_workflow.global_env_vars:
+                self.global_vars_text.edit_modified(False)
                 return
 
-            lines = vars_text.split('\n')
-            global_vars = {}
-            for line in lines:
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    global_vars[key.strip()] = value.strip()
-            self.current_workflow.global_env_vars = global_vars
+            global_vars = _parse_assignments(vars_text)
+            if global_vars != self.current_workflow.global_env_vars:
+                self.current_workflow.global_env_vars = global_vars
+                self.mark_dirty()
+            self._last_global_vars = (vars_text, self.current_workflow.global_env_vars)
             self.global_vars_text.edit_modified(False) # Reset modified flag
         except Exception as e:
             logger.error(f"Error parsing global variables: {e}")
     
-    def update_workflow_display(self):
-        """Update the workflow display"""
-        self.workflow_name_var.set(self.current_workflow.name)
-        self.workflow_desc_var.set(self.current_workflow.description)
-        vars_text = "\n".join([f"{k}={v}" for k, v in self.current_workflow.global_env_vars.items()])
-        self.global_vars_text.delete("1.0", tk.END)
-        self.global_vars_text.insert("1.0", vars_text)
-        self.global_vars_text.edit_modified(False)
-        self.canvas.render_workflow(self.current_workflow)
+    def update_workflow_display(self, dirty: Dirty = Dirty.ALL):
+        """Update the parts of the workflow display flagged in dirty"""
+        if dirty & Dirty.NAME:
+            self.workflow_name_var.set(self.current_workflow.name)
+        if dirty & Dirty.DESC:
+            self.workflow_desc_var.set(self.current_workflow.description)
+        if dirty & Dirty.VARS:
+            vars_text = "\n".join([f"{k}={v}" for k, v in self.current_workflow.global_env_vars.items()])
+            self.global_vars_text.delete("1.0", tk.END)
+            self.global_vars_text.insert("1.0", vars_text)
+            self.global_vars_text.edit_modified(False)
+        if dirty & Dirty.NODES:
+            self.canvas.render_workflow(self.current_workflow)  # Redraws connections as well
+        elif dirty & Dirty.EDGES:
+            self.canvas.draw_all_connections()
         
         # Update recommendations based on current context
-        if self.adaptive_interface_enabled:
+        if dirty & Dirty.RECOMMENDATIONS and self.adaptive_interface_enabled:
             current_context = self._determine_current_context()
             self._update_recommendations_panel(current_context)
     
+    def request_display_update(self, dirty: Dirty = Dirty.ALL):
+        """Refresh the parts flagged in dirty once the event loop is idle.
+        
+        Requests made before the refresh runs are merged into a single update_workflow_display call.
+        """
+        if not self._pending_dirty:
+            self.root.after_idle(self._flush_display_update)
+        self._pending_dirty |= dirty
+    
+    def _flush_display_update(self):
+        dirty, self._pending_dirty = self._pending_dirty, Dirty(0)
+        self.update_workflow_display(dirty)
+    
     def add_step(self):
         """Add a new step to the workflow"""
         new_step = WorkflowStep(name=f"Step {len(self.current_workflow.steps) + 1}")
@@ -1104,7 +1217,8 @@ Tips & Best Practices
         
         if new_step.name:
             self.current_workflow.steps.append(new_step)
-            self.update_workflow_display()
+            self.mark_dirty()
+            self.request_display_update(Dirty.GRAPH)
             # Track this interaction
             self.track_user_interaction("step_added", new_step.name)
     
@@ -1115,11 +1229,11 @@ Tips & Best Practices
             self.show_warning("No Selection", "Please select a step to edit")
             return
         
-        step = next((s for s in self.current_workflow.steps if s.id == step_id), None)
+        step = self.current_workflow.step_by_id(step_id)
         if step:
             editor = WorkflowEditor(self.root, step, self.current_workflow)
             self.root.wait_window(editor)
-            self.update_workflow_display()
+            self.request_display_update(Dirty.GRAPH)
     
     def delete_step(self):
         """Delete selected step"""
@@ -1129,11 +1243,7 @@ Tips & Best Practices
         
         step_id = self.selected_step_id
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this step?", parent=self.root):
-            self.current_workflow.steps = [s for s in self.current_workflow.steps if s.id != step_id]
-            for s in self.current_workflow.steps:
-                if step_id in s.dependencies:
-                    s.dependencies.remove(step_id)
-            self.update_workflow_display()
+            self._remove_steps(frozenset((step_id,)))
 
     def delete_selected_steps(self):
         """Delete all selected steps."""
@@ -1142,13 +1252,20 @@ Tips & Best Practices
             return
 
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(self.canvas.selected_node_ids)} steps?", parent=self.root):
-            for step_id in list(self.canvas.selected_node_ids):
-                self.current_workflow.steps = [s for s in self.current_workflow.steps if s.id != step_id]
-                for s in self.current_workflow.steps:
-                    if step_id in s.dependencies:
-                        s.dependencies.remove(step_id)
+            deleted = frozenset(self.canvas.selected_node_ids)
             self.canvas.selected_node_ids.clear()
-            self.update_workflow_display()
+            self._remove_steps(deleted)
+
+    def _remove_steps(self, deleted: frozenset):
+        """Remove the given steps and any dependencies on them in a single pass"""
+        steps = [s for s in self.current_workflow.steps if s.id not in deleted]
+        for s in steps:
+            if any(d in deleted for d in s.dependencies):
+                s.dependencies = [d for d in s.dependencies if d not in deleted]
+                self.mark_dirty(s.id)
+        self.current_workflow.steps = steps
+        self.mark_dirty()
+        self.update_workflow_display(Dirty.GRAPH)
 
     def toggle_selected_steps_enabled(self):
         """Toggle the enabled state of all selected steps."""
@@ -1161,7 +1278,7 @@ Tips & Best Practices
 
     def duplicate_step(self, step_id: str):
         """Duplicate the selected step."""
-        original_step = next((s for s in self.current_workflow.steps if s.id == step_id), None)
+        original_step = self.current_workflow.step_by_id(step_id)
         if not original_step:
             return
 
@@ -1172,13 +1289,13 @@ Tips & Best Practices
         new_step.pos_y += 40
 
         self.current_workflow.steps.append(new_step)
-        self.update_workflow_display()
+        self.mark_dirty()
+        self.update_workflow_display(Dirty.GRAPH)
 
     def run_from_step(self, step_id: str):
         """Run the workflow starting from a specific step."""
-        try:
-            start_index = next(i for i, s in enumerate(self.current_workflow.steps) if s.id == step_id)
-        except StopIteration:
+        start_index = self.current_workflow.step_position(step_id)
+        if start_index is None:
             self.show_error("Step Not Found", f"Could not find step with ID {step_id} to run from.")
             return
 
@@ -1195,6 +1312,8 @@ Tips & Best Practices
     def new_workflow(self):
         """Create a new workflow"""
         if messagebox.askyesno("New Workflow", "Are you sure? Unsaved changes will be lost.", parent=self.root):
+            self.flush_autosave()
+            self._step_dict_cache.clear()
             self.current_workflow = Workflow()
             self.current_filepath = None
             self.update_workflow_display()
@@ -1208,10 +1327,16 @@ Tips & Best Practices
             parent=self.root
         )
         if filename:
+            self.flush_autosave()
             try:
-                with open(filename, 'r') as f:
-                    data = yaml.safe_load(f) if filename.endswith(('.yaml', '.yml')) else json.load(f)
-                self.current_workflow = Workflow.from_dict(data)
+                if filename.endswith(('.yaml', '.yml')):
+                    import yaml
+                    with open(filename, 'r') as f:
+                        data = yaml.safe_load(f)
+                else:
+                    data = serialization.read_json(filename)  # Autosaves may be zstd-compressed
+                self.current_workflow = Workflow.from_dict_fast(data)
+                self._step_dict_cache.clear()
                 self.current_filepath = filename
                 self.update_workflow_display()
                 self.clear_log()
@@ -1224,13 +1349,17 @@ Tips & Best Practices
         if not self.current_filepath:
             return self.save_workflow_as()
 
+        self._flush_debounced()
+        if self._autosave_pending_id:
+            self.root.after_cancel(self._autosave_pending_id)
+            self._autosave_pending_id = None
         try:
-            data = self.current_workflow.to_dict()
-            with open(self.current_filepath, 'w') as f:
-                if self.current_filepath.endswith(('.yaml', '.yml')):
-                    yaml.dump(data, f, default_flow_style=False)
-                else:
-                    json.dump(data, f, indent=2)
+            data = self.current_workflow.to_dict(self._step_dict_cache)
+            if self.current_filepath.endswith(('.yaml', '.yml')):
+                _write_yaml(self.current_filepath, data)
+            else:
+                serialization.write_json(self.current_filepath, data, indent=True)
+            self._dirty = False
             self.last_saved_label.config(text=f"Last saved: {datetime.now().strftime('%H:%M:%S')}")
             self.show_info("Success", "Workflow saved successfully")
         except Exception as e:
@@ -1251,7 +1380,7 @@ Tips & Best Practices
     def load_template(self, template: Workflow):
         """Load a workflow template"""
         if messagebox.askyesno("Load Template", f"Load template '{template.name}'? Unsaved changes will be lost.", parent=self.root):
-            new_workflow = Workflow.from_dict(template.to_dict())
+            new_workflow = template.clone()
             
             id_map = {step.id: str(uuid.uuid4()) for step in new_workflow.steps}
             new_workflow.id = str(uuid.uuid4())
@@ -1260,6 +1389,8 @@ Tips & Best Practices
                 step.dependencies = [id_map[dep_id] for dep_id in step.dependencies if dep_id in id_map]
 
             self.current_workflow = new_workflow
+            self._step_dict_cache.clear()
+            self.mark_dirty()
             self.update_workflow_display()
             self.clear_log()
             # Track this interaction
@@ -1268,7 +1399,7 @@ Tips & Best Practices
     def parse_variables(self) -> Dict[str, str]:
         """Parse variables from the variables text field"""
         try:
-            return {k.strip(): v.strip() for line in self.variables_text.get("1.0", tk.END).strip().split("\n") if "=" in line for k, v in [line.split("=", 1)]}
+            return _parse_assignments(self.variables_text.get("1.0", tk.END))
         except Exception as e:
             self.show_error("Variable Parse Error", f"Failed to parse variables: {e}")
             return {}
@@ -1284,11 +1415,18 @@ Tips & Best Practices
         if not dry_run and not messagebox.askyesno("Execute Workflow", "Are you sure you want to execute this workflow?", parent=self.root):
             return
             
-        self.update_workflow_display()
+        # The runner is shared and abort() does not stop its thread, so wait for the
+        # previous run's thread itself rather than the runner's running flag
+        if self._run_thread is not None and self._run_thread.is_alive():
+            self.show_warning("Execution Running", "Wait for the current execution to finish")
+            return
+            
+        self.update_workflow_display(Dirty.GRAPH)
         variables = self.parse_variables()
-        self.runner = WorkflowRunner(dry_run=dry_run)
-        self.runner.set_status_callback(self.on_step_status_update)
-        self.runner.set_animation_callback(self.on_step_animation_update)
+        # One runner is reused across runs; only the per-run options change
+        self.runner.dry_run = dry_run
+        self.runner.use_asyncio = self.async_execution
+        self.runner.reset()
         
         # Start animation if enabled
         if self.animation_enabled and self.canvas:
@@ -1299,13 +1437,18 @@ Tips & Best Practices
             try:
                 self.log_message(f"Starting workflow {mode.lower()}...")
                 results = self.runner.execute_workflow(workflow, workflow.global_env_vars, variables)
-                self.display_results(results)
-                self.log_message(f"Workflow {mode.lower()} completed")
+                
+                def finish():
+                    self.display_results(results)
+                    self.log_message(f"Workflow {mode.lower()} completed")
+                self.root.after(0, finish)
             except Exception as e:
                 self.log_message(f"Workflow {mode.lower()} failed: {e}")
-                self.show_error(f"Workflow {mode} Error", f"Workflow {mode.lower()} failed: {e}")
+                self.root.after(0, self.show_error, f"Workflow {mode} Error", f"Workflow {mode.lower()} failed: {e}")
         
-        threading.Thread(target=run_in_thread, daemon=True).start()
+        self._run_thread = threading.Thread(target=run_in_thread, daemon=True)
+        self._run_thread.start()
+        self._start_anim_pump()
 
     def dry_run_workflow(self):
         self.run_workflow(dry_run=True, workflow=self.current_workflow)
@@ -1313,12 +1456,11 @@ Tips & Best Practices
     def execute_workflow(self):
         self.run_workflow(dry_run=False, workflow=self.current_workflow)
         
-    def on_step_status_update(self, step_id: Optional[str], status: Optional[StepStatus], message: str):
-        """Callback to update UI on step status change."""
+    def on_step_status_update(self, step_id: Optional[str], status: Optional[str], message: str):
+        """Callback to update UI on step status change. Called from the runner thread."""
         self.log_message(message)
         if step_id and status:
-            self.canvas.update_node_status(step_id, status)
-        self.root.update_idletasks()
+            self._anim_q.put_nowait((step_id, "status", status))
 
     def abort_execution(self):
         """Abort current execution"""
@@ -1332,6 +1474,8 @@ Tips & Best Practices
 
     def restart_application(self):
         """Restart the application."""
+        self.flush_autosave()
+        self._shutdown_user_data()
         python = sys.executable
         os.execl(python, python, *sys.argv)
     
@@ -1361,8 +1505,9 @@ Tips & Best Practices
             
         self.log_message("\n=== Execution Results ===")
         for step_id, result in results.items():
-            step_name = next((s.name for s in self.current_workflow.steps if s.id == step_id), "Unknown")
-            self.log_message(f"Step: {step_name} | Status: {result.status.value} | Time: {result.execution_time:.2f}s")
+            step = self.current_workflow.step_by_id(step_id)
+            step_name = step.name if step else "Unknown"
+            self.log_message(f"Step: {step_name} | Status: {result.status} | Time: {result.execution_time:.2f}s")
             if result.stdout:
                 self.log_message(f"  Output: {result.stdout[:200].strip()}{'...' if len(result.stdout) > 200 else ''}")
             if result.stderr:
@@ -1371,19 +1516,38 @@ Tips & Best Practices
                 self.log_message(f"  Info: {result.error_message}")
     
     def log_message(self, message: str):
-        """Add message to the execution log"""
-        def append():
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.insert(tk.END, f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n")
-            self.log_text.see(tk.END)
-            self.log_text.config(state=tk.DISABLED)
-        self.root.after(0, append)
+        """Add message to the execution log; may be called from any thread"""
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n"
+        with self._log_lock:
+            self._log_buf.append(line)
+            if self._log_flush_scheduled:
+                return
+            self._log_flush_scheduled = True
+        self.root.after(LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self):
+        """Write all buffered log lines to the widget in one insert"""
+        with self._log_lock:
+            lines = list(self._log_buf)
+            self._log_buf.clear()
+            self._log_flush_scheduled = False
+        if not lines:
+            return
+        self._log_lines.extend(lines)
+        self.log_text.insert(tk.END, "".join(lines))
+        # Keep the widget bounded; the full history stays in _log_lines for export.
+        # Flushes are rate-limited, so checking the length on each one is cheap.
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - LOG_WIDGET_MAX_LINES
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+        self.log_text.see(tk.END)
     
     def clear_log(self):
         """Clear the execution log"""
-        self.log_text.config(state=tk.NORMAL)
+        with self._log_lock:
+            self._log_buf.clear()
         self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        self._log_lines.clear()
         
         # Stop animation when clearing the log
         if self.canvas and self.animation_enabled:
@@ -4,12 +4,18 @@ Contains the WorkflowCanvas and WorkflowCanvasNode classes.
 """
 
 import tkinter as tk
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import random
-import uuid
+import time
 
 from models import WorkflowStep, Workflow, StepStatus, Particle
 
+ANIMATION_TICK_MS = 33  # Fixed particle frame interval (~30 fps)
+PARTICLE_RATE_FPS = 20  # Particle speeds are expressed per frame at this rate
+MAX_FRAME_GAP = 0.25  # Seconds; longer stalls do not make particles jump ahead further
+PARTICLE_POOL_SIZE = 256  # Finished particles kept for reuse
+MAX_PARTICLES = 400  # Live particles; bounds the Python work done per animation frame
+
 
 class WorkflowCanvasNode:
     """Represents a node on the visual workflow designer canvas."""
@@ -19,17 +25,20 @@ class WorkflowCanvasNode:
         self.width = 180
         self.height = 60
         
-        colors = self.canvas.app.themes[self.canvas.app.current_theme]
+        colors = self.canvas._colors
         
         self.rect_id = self.canvas.create_rectangle(
             self.step.pos_x, self.step.pos_y, self.step.pos_x + self.width, self.step.pos_y + self.height,
-            fill=colors["node_pending"], outline=colors["node_outline"], width=2, tags="node"
+            fill=colors.node_pending, outline=colors.node_outline, width=2, tags="node"
         )
         self.text_id = self.canvas.create_text(
             self.step.pos_x + self.width / 2, self.step.pos_y + self.height / 2,
-            text=self.step.name, width=self.width - 10, tags="node_text", fill=colors["node_text"]
+            text=self.step.name, width=self.width - 10, tags="node_text", fill=colors.node_text
         )
         
+        self.canvas._item_to_node[self.rect_id] = self
+        self.canvas._item_to_node[self.text_id] = self
+        
         self.canvas.tag_bind(self.rect_id, "<ButtonPress-1>", self.on_press)
         self.canvas.tag_bind(self.rect_id, "<B1-Motion>", self.on_drag)
         self.canvas.tag_bind(self.rect_id, "<Double-Button-1>", self.on_double_click)
@@ -42,9 +51,9 @@ class WorkflowCanvasNode:
 
     def update_enabled_state(self):
         """Update the visual state of the node based on its enabled status."""
-        colors = self.canvas.app.themes[self.canvas.app.current_theme]
+        colors = self.canvas._colors
         if self.step.enabled:
-            self.canvas.itemconfig(self.rect_id, outline=colors["node_outline"])
+            self.canvas.itemconfig(self.rect_id, outline=colors.node_outline)
         else:
             self.canvas.itemconfig(self.rect_id, outline="grey", dash=(4, 4))
 
@@ -57,30 +66,30 @@ class WorkflowCanvasNode:
         dx = self.canvas.canvasx(event.x) - self._drag_data["x"]
         dy = self.canvas.canvasy(event.y) - self._drag_data["y"]
 
-        for node_id in self.canvas.selected_node_ids:
-            node = self.canvas.nodes[node_id]
-            self.canvas.move(node.rect_id, dx, dy)
-            self.canvas.move(node.text_id, dx, dy)
-            node.step.pos_x += dx
-            node.step.pos_y += dy
-            # Update original coordinates for proper zooming
-            self.canvas.update_original_coords_for_node(node.step.id)
+        if dx or dy:
+            for node_id in self.canvas.selected_node_ids:
+                node = self.canvas.nodes[node_id]
+                self.canvas.move(node.rect_id, dx, dy)
+                self.canvas.move(node.text_id, dx, dy)
+                node.step.pos_x += dx
+                node.step.pos_y += dy
+            # Connections, zoom coordinates and the scroll region catch up once per idle cycle
+            self.canvas.schedule_moved_redraw(self.canvas.selected_node_ids)
 
         self._drag_data["x"] = self.canvas.canvasx(event.x)
         self._drag_data["y"] = self.canvas.canvasy(event.y)
-        self.canvas.update_scroll_region()
 
     def on_double_click(self, event):
         self.canvas.app.edit_step(self.step.id)
 
-    def update_status(self, status: StepStatus):
-        colors = self.canvas.app.themes[self.canvas.app.current_theme]
+    def update_status(self, status: str):
+        colors = self.canvas._colors
         color_map = {
-            StepStatus.PENDING: colors["node_pending"], StepStatus.RUNNING: colors["node_running"],
-            StepStatus.SUCCESS: colors["node_success"], StepStatus.FAILED: colors["node_failed"],
-            StepStatus.SKIPPED: colors["node_skipped"], StepStatus.TIMEOUT: colors["node_timeout"]
+            StepStatus.PENDING: colors.node_pending, StepStatus.RUNNING: colors.node_running,
+            StepStatus.SUCCESS: colors.node_success, StepStatus.FAILED: colors.node_failed,
+            StepStatus.SKIPPED: colors.node_skipped, StepStatus.TIMEOUT: colors.node_timeout
         }
-        self.canvas.itemconfig(self.rect_id, fill=color_map.get(status, colors["canvas_bg"]))
+        self.canvas.itemconfig(self.rect_id, fill=color_map.get(status, colors.canvas_bg))
         
     def update_text(self):
         self.canvas.itemconfig(self.text_id, text=self.step.name)
@@ -112,15 +121,13 @@ class WorkflowCanvas(tk.Canvas):
         self.rescale_canvas()
 
     def rescale_canvas(self):
-        for item_id, original_coords in self.original_coords.items():
-            new_coords = [c * self.zoom_factor for c in original_coords]
-            self.coords(item_id, *new_coords)
-
-            if "node_text" in self.gettags(item_id):
-                font_size = int(10 * self.zoom_factor)
-                if font_size < 1:
-                    font_size = 1
-                self.itemconfig(item_id, font=("Courier", font_size))
+        """Bring every item on the canvas to the current zoom factor"""
+        if abs(self.zoom_factor - self._applied_zoom) < 1e-6:
+            return  # e.g. zooming in and out again, or resetting an unzoomed canvas
+        factor = self.zoom_factor / self._applied_zoom
+        self.scale("all", 0, 0, factor, factor)
+        self._applied_zoom = self.zoom_factor
+        self.itemconfig("node_text", font=("Courier", max(1, int(10 * self.zoom_factor))))
 
     def update_original_coords_for_node(self, step_id):
         """Update original coordinates for a node after it has been moved."""
@@ -140,6 +147,23 @@ class WorkflowCanvas(tk.Canvas):
         # Update connection coordinates
         self.update_connections_for_node(step_id)
 
+    def schedule_moved_redraw(self, step_ids):
+        """Queue a connection redraw for moved nodes on the next idle cycle"""
+        self._moved_node_ids.update(step_ids)
+        if self._moved_redraw_id is None:
+            self._moved_redraw_id = self.after_idle(self._redraw_moved_connections)
+
+    def _redraw_moved_connections(self):
+        self._moved_redraw_id = None
+        moved = [step_id for step_id in self._moved_node_ids if step_id in self.nodes]
+        self._moved_node_ids.clear()
+        for step_id in moved:
+            # Update original coordinates for proper zooming
+            self.update_original_coords_for_node(step_id)
+        if moved:
+            self.app.mark_dirty(*moved)
+        self.request_scroll_update()
+
     def update_all_original_coords(self):
         """Update original coordinates for all nodes and connections."""
         # Update node coordinates
@@ -156,42 +180,42 @@ class WorkflowCanvas(tk.Canvas):
             )
         
         # Update connection coordinates
-        for step in self.app.current_workflow.steps:
-            if step.id not in self.nodes: 
-                continue
-            for dep_id in step.dependencies:
-                if dep_id in self.nodes:
-                    # We need to find the connection line and update its coordinates
-                    from_node = self.nodes[dep_id]
-                    to_node = self.nodes[step.id]
-                    line_coords = (
-                        from_node.step.pos_x + from_node.width, from_node.step.pos_y + from_node.height / 2,
-                        to_node.step.pos_x, to_node.step.pos_y + to_node.height / 2
-                    )
-                    # Find the line in our connections
-                    for conn_id in self.connections:
-                        tags = self.gettags(conn_id)
-                        if f"conn-from-{dep_id}" in tags and f"conn-to-{step.id}" in tags:
-                            self.original_coords[conn_id] = line_coords
-                            break
+        for (from_id, to_id), conn_id in self.conns_by_endpoints.items():
+            from_node = self.nodes.get(from_id)
+            to_node = self.nodes.get(to_id)
+            if from_node and to_node:
+                self.original_coords[conn_id] = self._connection_coords(from_node, to_node)
 
     def __init__(self, parent, app):
-        super().__init__(parent, bg=app.themes[app.current_theme]["canvas_bg"], highlightthickness=0)
+        super().__init__(parent, bg=app.themes[app.current_theme].canvas_bg, highlightthickness=0)
         self.app = app
+        self._colors = app.themes[app.current_theme]  # Current palette; see refresh_theme()
         self.nodes: Dict[str, WorkflowCanvasNode] = {}
+        self._item_to_node: Dict[int, WorkflowCanvasNode] = {}  # rect and text item -> node
+        self._moved_node_ids: set[str] = set()  # Dragged nodes whose connections await a redraw
+        self._moved_redraw_id = None
+        self._scroll_update_id = None  # Pending idle update_scroll_region, if any
         self.connections = []
+        self.conns_by_endpoints: Dict[Tuple[str, str], int] = {}  # (from_id, to_id) -> line item
+        self._conn_tags: Dict[Tuple[str, str], Tuple[str, str]] = {}  # (from_id, to_id) -> line tags
         self.selected_node_id: Optional[str] = None
         self.selected_node_ids: set[str] = set()
         
         # Particle animation system
-        self.particles: Dict[str, 'Particle'] = {}
-        self.particle_items: Dict[str, int] = {}  # particle_id -> canvas_item_id
+        self.particles: Dict[int, 'Particle'] = {}
+        self.particle_items: Dict[int, int] = {}  # particle_id -> canvas_item_id
+        self._hidden_particles: set[int] = set()  # Particles whose items are hidden while offscreen
+        self._particle_pool: List[Particle] = []  # Finished particles kept for reuse
+        self._particle_sprites: Dict[Tuple[str, str, int], Any] = {}  # (shape, color, size) -> PhotoImage
+        self._next_pid = 0
         self.animation_running = False
         self.animation_job = None
+        self._last_tick = 0.0
         
         self.connection_start_node = None
         self.connection_preview_line = None
         self.zoom_factor = 1.0
+        self._applied_zoom = 1.0  # Zoom the items currently on the canvas were scaled to
         self.original_coords = {}
 
         self.bind("<Shift-ButtonPress-1>", self.start_connection)
@@ -200,10 +224,15 @@ class WorkflowCanvas(tk.Canvas):
         self.bind("<Control-MouseWheel>", self.zoom)
         self.bind("<Button-3>", self.show_context_menu)
         
+    def refresh_theme(self):
+        """Pick up the app's current theme palette; call whenever the theme changes"""
+        self._colors = self.app.themes[self.app.current_theme]
+
     def start_animation(self):
         """Start the particle animation system"""
         if not self.animation_running:
             self.animation_running = True
+            self._last_tick = time.perf_counter()
             self.animate_particles()
     
     def stop_animation(self):
@@ -213,103 +242,113 @@ class WorkflowCanvas(tk.Canvas):
             self.after_cancel(self.animation_job)
             self.animation_job = None
         # Clear all particles
-        for item_id in self.particle_items.values():
-            self.delete(item_id)
-        self.particle_items.clear()
-        self.particles.clear()
+        for particle_id in list(self.particles):
+            self._release_particle(particle_id)
     
     def animate_particles(self):
         """Main animation loop for particles"""
         if not self.animation_running:
             return
             
-        # Update particle positions
+        # Advance by elapsed time so motion stays smooth when frames run late
+        now = time.perf_counter()
+        dt = min(now - self._last_tick, MAX_FRAME_GAP)
+        self._last_tick = now
+        speed = getattr(self.app, 'animation_speed', 1.0) * dt * PARTICLE_RATE_FPS
+        
+        # Visible region in canvas coordinates, padded by the largest particle size
+        vx0, vy0 = self.canvasx(0) - 8, self.canvasy(0) - 8
+        vx1, vy1 = vx0 + self.winfo_width() + 16, vy0 + self.winfo_height() + 16
+        hidden = self._hidden_particles
+        
+        # Update particle positions; Tk and helper lookups are hoisted out of the per-particle loop
+        original_coords = self.original_coords
+        items = self.particle_items
+        coords = self.coords
         particles_to_remove = []
-        for particle_id, particle in list(self.particles.items()):
-            # Move particle along connection, adjusted by animation speed
-            particle.progress += particle.speed * getattr(self.app, 'animation_speed', 1.0)
-            
-            # Get connection coordinates
-            conn_coords = self.original_coords.get(particle.connection_id)
-            if not conn_coords:
+        guidance_to_respawn = []  # Created after the loop; self.particles must not change while iterating
+        for particle in self.particles.values():
+            particle_id = particle.id
+            if particle.connection_id not in original_coords:
                 particles_to_remove.append(particle_id)
                 continue
-                
-            x1, y1, x2, y2 = conn_coords
-            # Calculate new position based on progress
-            particle.x = x1 + (x2 - x1) * particle.progress
-            particle.y = y1 + (y2 - y1) * particle.progress
             
-            # Draw particle
-            self.draw_particle(particle)
+            # Move particle along connection, adjusted by animation speed
+            particle.progress += particle.speed * speed
+            particle.x += particle.dx_step * speed
+            particle.y += particle.dy_step * speed
+            
+            # Draw particle, or hide it while it is outside the visible area
+            if vx0 <= particle.x <= vx1 and vy0 <= particle.y <= vy1:
+                item_id = items.get(particle_id)
+                if item_id is None:
+                    self._create_particle_item(particle)
+                else:
+                    if particle_id in hidden:
+                        hidden.discard(particle_id)
+                        self.itemconfigure(item_id, state="normal")
+                    coords(item_id, particle.x, particle.y)
+            elif particle_id not in hidden and particle_id in items:
+                hidden.add(particle_id)
+                self.itemconfigure(items[particle_id], state="hidden")
             
             # Remove particles that have completed their journey
             if particle.progress >= 1.0:
                 particles_to_remove.append(particle_id)
                 # For guidance particles, create a new one to maintain continuous guidance
                 if particle.particle_type == "guidance":
-                    self.create_particle(particle.connection_id, particle.activity_type, "guidance")
+                    guidance_to_respawn.append((particle.connection_id, particle.activity_type))
         
         # Remove completed particles
         for particle_id in particles_to_remove:
-            if particle_id in self.particle_items:
-                self.delete(self.particle_items[particle_id])
-                del self.particle_items[particle_id]
-            if particle_id in self.particles:
-                del self.particles[particle_id]
+            self._release_particle(particle_id)
+        for connection_id, activity_type in guidance_to_respawn:
+            self.create_particle(connection_id, activity_type, "guidance")
                 
-        # Schedule next animation frame
-        # Adjust animation speed (higher speed = faster animation = shorter delay)
-        delay = int(50 / getattr(self.app, 'animation_speed', 1.0))
-        delay = max(10, min(100, delay))  # Keep delay between 10ms and 100ms
-        self.animation_job = self.after(delay, self.animate_particles)
+        # Schedule next animation frame; speed only scales the distance moved per frame
+        self.animation_job = self.after(ANIMATION_TICK_MS, self.animate_particles)
     
+    def _particle_sprite(self, shape: str, color: str, size: int) -> Any:
+        """Pre-rendered image for a particle look, drawn once and shared by all such particles"""
+        key = (shape, color, size)
+        sprite = self._particle_sprites.get(key)
+        if sprite is None:
+            from PIL import Image, ImageDraw, ImageTk  # Only needed once particles are shown
+            # Draw at 4x and downsample so the small shapes come out antialiased
+            n = size * 4
+            image = Image.new("RGBA", (n, n), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            if shape == "square":
+                draw.rectangle((0, 0, n - 1, n - 1), fill=color)
+            elif shape == "diamond":
+                draw.polygon([(n / 2, 0), (n, n / 2), (n / 2, n), (0, n / 2)], fill=color)
+            else:  # circle (default)
+                draw.ellipse((0, 0, n - 1, n - 1), fill=color)
+            image = image.resize((size, size), Image.Resampling.LANCZOS)
+            sprite = self._particle_sprites[key] = ImageTk.PhotoImage(image, master=self)
+        return sprite
+
+    def _create_particle_item(self, particle):
+        """Create the single canvas item a particle keeps for its whole lifetime"""
+        color = particle.color if particle.color else self._colors.conn_color
+        sprite = self._particle_sprite(particle.shape, color, max(1, round(particle.size)))
+        self.particle_items[particle.id] = self.create_image(particle.x, particle.y, image=sprite, anchor=tk.CENTER)
+
     def draw_particle(self, particle):
-        """Draw a particle on the canvas"""
-        # Remove existing particle item if it exists
-        if particle.id in self.particle_items:
-            self.delete(self.particle_items[particle.id])
-            
-        # Create new particle item based on shape
-        colors = self.app.themes[self.app.current_theme]
-        particle_color = particle.color if particle.color else colors["conn_color"]
-        
-        if particle.shape == "square":
-            item_id = self.create_rectangle(
-                particle.x - particle.size/2, particle.y - particle.size/2,
-                particle.x + particle.size/2, particle.y + particle.size/2,
-                fill=particle_color, outline=""
-            )
-        elif particle.shape == "diamond":
-            item_id = self.create_polygon(
-                particle.x, particle.y - particle.size/2,
-                particle.x + particle.size/2, particle.y,
-                particle.x, particle.y + particle.size/2,
-                particle.x - particle.size/2, particle.y,
-                fill=particle_color, outline=""
-            )
-        else:  # circle (default)
-            item_id = self.create_oval(
-                particle.x - particle.size/2, particle.y - particle.size/2,
-                particle.x + particle.size/2, particle.y + particle.size/2,
-                fill=particle_color, outline=""
-            )
-            
-        self.particle_items[particle.id] = item_id
+        """Move a particle's canvas item to the particle's current position"""
+        item_id = self.particle_items.get(particle.id)
+        if item_id is None:
+            self._create_particle_item(particle)
+        else:
+            self.coords(item_id, particle.x, particle.y)
     
     def create_particle(self, connection_id: str, activity_type: str = "generic", particle_type: str = "data"):
         """Create a new particle for animation"""
-        import uuid
-        
-        # Get connection coordinates
-        conn_coords = self.original_coords.get(connection_id)
-        if not conn_coords:
+        if connection_id not in self.original_coords or len(self.particles) >= MAX_PARTICLES:
             return None
-            
-        x1, y1, x2, y2 = conn_coords
         
         # Determine particle properties based on activity type
-        colors = self.app.themes[self.app.current_theme]
+        colors = self._colors
         if activity_type == "dns":
             color = "#4A90E2"  # Blue for DNS
             shape = "circle"
@@ -320,7 +359,7 @@ class WorkflowCanvas(tk.Canvas):
             color = "#D0021B"  # Red for file transfers
             shape = "diamond"
         else:
-            color = colors["conn_color"]  # Default connection color
+            color = colors.conn_color  # Default connection color
             shape = "circle"
             
         # For guidance particles, use a different appearance
@@ -331,12 +370,8 @@ class WorkflowCanvas(tk.Canvas):
         else:
             size = 4 + random.random() * 4  # Random size between 4 and 8
             
-        particle = Particle(
-            id=str(uuid.uuid4()),
-            x=x1,
-            y=y1,
-            connection_id=connection_id,
-            progress=0.0,
+        return self._spawn_particle(
+            connection_id,
             speed=0.02 + random.random() * 0.03,  # Random speed between 0.02 and 0.05
             color=color,
             size=size,
@@ -344,9 +379,57 @@ class WorkflowCanvas(tk.Canvas):
             activity_type=activity_type,
             particle_type=particle_type
         )
+    
+    def _spawn_particle(self, connection_id: int, speed: float, color: str, size: float, shape: str,
+                        activity_type: str, particle_type: str) -> Particle:
+        """Register a particle at the start of a connection, reusing a pooled one if possible"""
+        self._next_pid += 1
+        if self._particle_pool:
+            particle = self._particle_pool.pop()
+            particle.id = self._next_pid
+            particle.connection_id = connection_id
+            particle.progress = 0.0
+            particle.speed = speed
+            particle.color = color
+            particle.size = size
+            particle.shape = shape
+            particle.activity_type = activity_type
+            particle.particle_type = particle_type
+            particle.x = particle.y = particle.dx_step = particle.dy_step = 0.0
+        else:
+            particle = Particle(
+                id=self._next_pid, x=0.0, y=0.0, connection_id=connection_id, progress=0.0, speed=speed,
+                color=color, size=size, shape=shape, activity_type=activity_type, particle_type=particle_type
+            )
+        conn_coords = self.original_coords.get(connection_id)
+        if conn_coords:
+            particle.set_path(*conn_coords)
         
         self.particles[particle.id] = particle
+        self._create_particle_item(particle)
         return particle
+
+    def _release_particle(self, particle_id: int):
+        """Remove a particle and its canvas item, keeping the object for reuse"""
+        item_id = self.particle_items.pop(particle_id, None)
+        if item_id is not None:
+            self.delete(item_id)
+        particle = self.particles.pop(particle_id, None)
+        if particle is not None and len(self._particle_pool) < PARTICLE_POOL_SIZE:
+            self._particle_pool.append(particle)
+        self._hidden_particles.discard(particle_id)
+    
+    def create_particles(self, batch: List[Tuple[int, str]]) -> List[Particle]:
+        """Create particles for several (connection_id, activity_type) pairs at once.
+        
+        Each particle gets its canvas item here; animation frames then only move it.
+        """
+        created = []
+        for connection_id, activity_type in batch:
+            particle = self.create_particle(connection_id, activity_type)
+            if particle:
+                created.append(particle)
+        return created
     
     def create_guidance_particles(self, context: str = "general"):
         """Create guidance particles to anticipate user's next steps"""
@@ -356,12 +439,8 @@ class WorkflowCanvas(tk.Canvas):
         # Create subtle guidance particles on frequently used connections
         for conn_id in self.connections[:3]:  # Limit to first 3 connections
             # Create a guidance particle with slower speed for subtlety
-            particle = Particle(
-                id=str(uuid.uuid4()),
-                x=0,  # Will be set based on connection
-                y=0,  # Will be set based on connection
-                connection_id=conn_id,
-                progress=0.0,
+            self._spawn_particle(
+                conn_id,
                 speed=0.01,  # Slow speed for subtlety
                 color="#7ED321",  # Green for guidance
                 size=6,
@@ -369,15 +448,6 @@ class WorkflowCanvas(tk.Canvas):
                 activity_type="guidance",
                 particle_type="guidance"
             )
-            
-            # Set initial position based on connection
-            conn_coords = self.original_coords.get(conn_id)
-            if conn_coords:
-                x1, y1, x2, y2 = conn_coords
-                particle.x = x1
-                particle.y = y1
-            
-            self.particles[particle.id] = particle
 
     def show_context_menu(self, event):
         """Display a context menu on right-click."""
@@ -407,27 +477,18 @@ class WorkflowCanvas(tk.Canvas):
 
     def toggle_step_enabled(self, step_id: str):
         """Toggle the enabled state of a step."""
-        step = next((s for s in self.app.current_workflow.steps if s.id == step_id), None)
-        if step:
-            step.enabled = not step.enabled
-            self.nodes[step_id].update_enabled_state()
+        node = self.nodes.get(step_id)
+        if node:
+            node.step.enabled = not node.step.enabled
+            node.update_enabled_state()
+            self.app.mark_dirty(step_id)
 
     def get_node_at_pos(self, x: int, y: int) -> Optional[WorkflowCanvasNode]:
         """Find the node under the cursor."""
-        items = self.find_overlapping(x, y, x, y)
-        if not items:
-            return None
-        
-        node_rect_id = None
-        for item in reversed(items):
-            if "node" in self.gettags(item):
-                node_rect_id = item
-                break
-        
-        if node_rect_id:
-            for node in self.nodes.values():
-                if node.rect_id == node_rect_id:
-                    return node
+        for item in reversed(self.find_overlapping(x, y, x, y)):
+            node = self._item_to_node.get(item)
+            if node:
+                return node
         return None
 
     def start_connection(self, event):
@@ -445,14 +506,14 @@ class WorkflowCanvas(tk.Canvas):
             self.connection_preview_line = None
             
         start_node = self.connection_start_node
-        colors = self.app.themes[self.app.current_theme]
+        colors = self._colors
         
         self.connection_preview_line = self.create_line(
             start_node.step.pos_x + start_node.width / 2,
             start_node.step.pos_y + start_node.height / 2,
             event.x,
             event.y,
-            fill=colors["conn_color"],
+            fill=colors.conn_color,
             dash=(4, 4),
             width=2
         )
@@ -478,28 +539,42 @@ class WorkflowCanvas(tk.Canvas):
             
             if start_node.step.id not in end_node.step.dependencies:
                 end_node.step.dependencies.append(start_node.step.id)
+                self.app.mark_dirty(end_node.step.id)
                 self.draw_all_connections()
 
     def is_circular_dependency(self, start_step: WorkflowStep, end_step: WorkflowStep) -> bool:
-        """Check if making end_step dependent on start_step creates a cycle."""
-        q = [end_step.id]
-        visited = {end_step.id}
-        
-        while q:
-            current_id = q.pop(0)
-            if current_id == start_step.id:
+        """Check if making end_step dependent on start_step creates a cycle.
+
+        That happens exactly when start_step already depends, directly or
+        transitively, on end_step.
+        """
+        workflow = self.app.current_workflow
+        stack = [start_step.id]
+        visited = {start_step.id}
+        
+        while stack:
+            current_id = stack.pop()
+            if current_id == end_step.id:
                 return True
                 
-            current_step = next((s for s in self.app.current_workflow.steps if s.id == current_id), None)
+            current_step = workflow.step_by_id(current_id)
             if not current_step: continue
                 
             for dep_id in current_step.dependencies:
                 if dep_id not in visited:
                     visited.add(dep_id)
-                    q.append(dep_id)
+                    stack.append(dep_id)
         return False
 
+    def request_scroll_update(self):
+        """Recompute the scroll region once the current burst of events has been handled"""
+        if self._scroll_update_id is None:
+            self._scroll_update_id = self.after_idle(self.update_scroll_region)
+
     def update_scroll_region(self):
+        if self._scroll_update_id is not None:
+            self.after_cancel(self._scroll_update_id)
+            self._scroll_update_id = None
         bbox = self.bbox("all")
         if bbox:
             self.config(scrollregion=bbox)
@@ -508,8 +583,12 @@ class WorkflowCanvas(tk.Canvas):
 
     def render_workflow(self, workflow: Workflow):
         self.delete("all")
+        self._applied_zoom = 1.0  # Everything below is drawn at model coordinates
         self.nodes = {}
+        self._item_to_node = {}
         self.connections = []
+        self.conns_by_endpoints = {}
+        self._conn_tags = {}
 
         positions = {(s.pos_x, s.pos_y) for s in workflow.steps}
         has_layout_info = len(positions) > 1 or len(workflow.steps) <= 1
@@ -523,8 +602,10 @@ class WorkflowCanvas(tk.Canvas):
         # Initialize original coordinates for all nodes and connections
         self.update_all_original_coords()
         self.draw_all_connections()
+        if self.zoom_factor != 1.0:
+            self.rescale_canvas()
         self.select_node(self.selected_node_id)
-        self.update_scroll_region()
+        self.request_scroll_update()
 
     def auto_layout(self):
         """Arranges nodes in a simple grid layout if no position data is provided."""
@@ -548,14 +629,17 @@ class WorkflowCanvas(tk.Canvas):
                 x = 50
                 y += node.height + spacing
         
-        self.update_scroll_region()
+        self.app.mark_dirty(*self.nodes)
+        self.request_scroll_update()
 
     def draw_all_connections(self):
         """Draw all connections between nodes based on step dependencies."""
         # Clear existing connections
         for conn in self.connections:
             self.delete(conn)
+            self.original_coords.pop(conn, None)
         self.connections = []
+        self.conns_by_endpoints = {}
         
         # Draw new connections
         for step in self.app.current_workflow.steps:
@@ -565,66 +649,97 @@ class WorkflowCanvas(tk.Canvas):
                 if dep_id in self.nodes:
                     self.draw_connection(dep_id, step.id)
 
+    @staticmethod
+    def _connection_coords(from_node: WorkflowCanvasNode, to_node: WorkflowCanvasNode) -> Tuple[float, float, float, float]:
+        """Unzoomed line coordinates from the right edge of from_node to the left edge of to_node"""
+        return (
+            from_node.step.pos_x + from_node.width, from_node.step.pos_y + from_node.height / 2,
+            to_node.step.pos_x, to_node.step.pos_y + to_node.height / 2
+        )
+
     def draw_connection(self, from_id: str, to_id: str):
-        from_node = self.nodes[from_id]
-        to_node = self.nodes[to_id]
-        colors = self.app.themes[self.app.current_theme]
+        coords = self._connection_coords(self.nodes[from_id], self.nodes[to_id])
+        colors = self._colors
+        
+        tags = self._conn_tags.get((from_id, to_id))
+        if tags is None:
+            tags = self._conn_tags[(from_id, to_id)] = (f"conn-from-{from_id}", f"conn-to-{to_id}")
         
+        # Lines never take pointer events, so they are created disabled and skipped by Tk's event hit-testing
         line = self.create_line(
-            from_node.step.pos_x + from_node.width, from_node.step.pos_y + from_node.height / 2,
-            to_node.step.pos_x, to_node.step.pos_y + to_node.height / 2,
-            arrow=tk.LAST, fill=colors["conn_color"], width=2, tags=(f"conn-from-{from_id}", f"conn-to-{to_id}")
-        )
-        self.original_coords[line] = (
-            from_node.step.pos_x + from_node.width, from_node.step.pos_y + from_node.height / 2,
-            to_node.step.pos_x, to_node.step.pos_y + to_node.height / 2
+            *coords,
+            arrow=tk.LAST, fill=colors.conn_color, width=2, tags=tags, state=tk.DISABLED
         )
+        self.original_coords[line] = coords
+        if self._applied_zoom != 1.0:
+            # Lines redrawn while zoomed must match the already scaled nodes
+            self.scale(line, 0, 0, self._applied_zoom, self._applied_zoom)
         self.connections.append(line)
+        self.conns_by_endpoints[(from_id, to_id)] = line
         return line
 
     def update_connections_for_node(self, step_id: str):
-        # Remove connections involving this node
-        self.delete(f"conn-from-{step_id}", f"conn-to-{step_id}")
-        
-        # Remove these connections from our connections list
-        connections_to_remove = []
-        for conn in self.connections:
-            tags = self.gettags(conn)
-            if f"conn-from-{step_id}" in tags or f"conn-to-{step_id}" in tags:
-                connections_to_remove.append(conn)
-        
-        for conn in connections_to_remove:
-            self.connections.remove(conn)
-        
-        # Redraw connections for this node
+        """Bring the connection lines touching a node in line with its position and dependencies"""
+        wanted = set()
         for step in self.app.current_workflow.steps:
-            if step_id in step.dependencies and step.id in self.nodes:
-                # This step depends on the moved node
-                self.draw_connection(step_id, step.id)
+            if step.id not in self.nodes:
+                continue
+            if step_id in step.dependencies:
+                wanted.add((step_id, step.id))  # This step depends on the moved node
             elif step.id == step_id:
-                # This is the moved node, redraw its outgoing connections
-                for dep_id in step.dependencies:
-                    if dep_id in self.nodes:
-                        self.draw_connection(dep_id, step_id)
+                wanted.update((dep_id, step_id) for dep_id in step.dependencies if dep_id in self.nodes)
 
-    def update_node_status(self, step_id: str, status: StepStatus):
+        # Drop lines for dependencies that no longer exist
+        removed = set()
+        for endpoints in [e for e in self.conns_by_endpoints if step_id in e and e not in wanted]:
+            conn = self.conns_by_endpoints.pop(endpoints)
+            self.delete(conn)
+            self.original_coords.pop(conn, None)
+            removed.add(conn)
+        if removed:
+            self.connections = [conn for conn in self.connections if conn not in removed]
+
+        # Move existing lines in place and draw only the new ones
+        zoom = self._applied_zoom
+        moved = set()
+        for from_id, to_id in wanted:
+            line = self.conns_by_endpoints.get((from_id, to_id))
+            if line is None:
+                self.draw_connection(from_id, to_id)
+                continue
+            coords = self._connection_coords(self.nodes[from_id], self.nodes[to_id])
+            self.original_coords[line] = coords
+            self.coords(line, *(c * zoom for c in coords))
+            moved.add(line)
+
+        # Keep particles travelling on the moved lines, with steps for the new endpoints
+        if moved and self.particles:
+            for particle in self.particles.values():
+                if particle.connection_id in moved:
+                    particle.set_path(*self.original_coords[particle.connection_id])
+
+    def update_node_status(self, step_id: str, status: str):
         if step_id in self.nodes:
             self.nodes[step_id].update_status(status)
 
     def select_node(self, step_id: Optional[str], ctrl_pressed: bool = False):
+        outline = self._colors.node_outline
         if not ctrl_pressed:
-            # Clear previous selection
-            for node_id in self.selected_node_ids:
-                if node_id in self.nodes:
-                    self.itemconfig(self.nodes[node_id].rect_id, outline=self.app.themes[self.app.current_theme]["node_outline"], width=2)
+            # Clear previous selection; selected rects carry the "selected" tag
+            self.itemconfig("selected", outline=outline, width=2)
+            self.dtag("selected", "selected")
             self.selected_node_ids.clear()
 
         if step_id in self.selected_node_ids:
             self.selected_node_ids.remove(step_id)
-            self.itemconfig(self.nodes[step_id].rect_id, outline=self.app.themes[self.app.current_theme]["node_outline"], width=2)
+            rect_id = self.nodes[step_id].rect_id
+            self.itemconfig(rect_id, outline=outline, width=2)
+            self.dtag(rect_id, "selected")
         elif step_id:
             self.selected_node_ids.add(step_id)
-            self.itemconfig(self.nodes[step_id].rect_id, outline="red", width=3)
+            rect_id = self.nodes[step_id].rect_id
+            self.itemconfig(rect_id, outline="red", width=3)
+            self.addtag_withtag("selected", rect_id)
 
         # For single selection compatibility
         if len(self.selected_node_ids) == 1:
@@ -4,17 +4,25 @@ Contains TemplateManager, LoadingScreen, and SettingsPanel classes.
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
 import tkinter.scrolledtext as scrolledtext
 from tkinter import ttk, messagebox
 import os
+import itertools
 import json
+import operator
 import random
 from typing import Optional
 from dataclasses import asdict
-from PIL import Image, ImageTk
 
 from gui.editors import TemplateEditor
 
+FRAME_MS = 30  # Loading screen animation frame interval
+GLOW_EVERY = 7  # Frames between title glow colour changes (~200 ms)
+MATRIX_CHARS = "".join(map(chr, range(33, 127)))  # Printable ASCII drawn by the matrix rain
+MATRIX_MUTATIONS_PER_FRAME = 20  # Characters changed per frame across all streams
+TEMPLATE_ROWS_PER_CHUNK = 50  # Template Manager rows inserted per idle callback
+
 
 class TemplateManager(tk.Toplevel):
     """GUI for managing user-created workflow templates."""
@@ -28,7 +36,7 @@ class TemplateManager(tk.Toplevel):
         self.transient(parent)
 
         colors = self.app.themes[self.app.current_theme]
-        self.config(bg=colors["bg"])
+        self.config(bg=colors.bg)
 
         top_frame = ttk.Frame(self)
         top_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -37,12 +45,13 @@ class TemplateManager(tk.Toplevel):
         list_frame = ttk.Frame(self)
         list_frame.pack(expand=True, fill=tk.BOTH, padx=10)
         
-        self.listbox = tk.Listbox(list_frame, bg=colors["widget_bg"], fg=colors["widget_fg"])
-        self.listbox.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        # Rows are keyed by template filename
+        self.tree = ttk.Treeview(list_frame, show="tree", selectmode="browse")
+        self.tree.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
         
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.listbox.yview)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.listbox.config(yscrollcommand=scrollbar.set)
+        self.tree.config(yscrollcommand=scrollbar.set)
 
         button_frame = ttk.Frame(self)
         button_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -52,47 +61,74 @@ class TemplateManager(tk.Toplevel):
         ttk.Button(button_frame, text="Delete", command=self.delete_selected).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Close", command=self.destroy).pack(side=tk.RIGHT)
 
+        self._listed_mtime: Optional[int] = None  # Templates directory mtime the list reflects
+        self._fill_after = None  # Pending callback inserting the next chunk of rows
         self.load_template_list()
 
     def load_template_list(self):
-        self.listbox.delete(0, tk.END)
         try:
-            for filename in sorted(os.listdir(self.app.templates_dir)):
-                if filename.endswith(".json"):
-                    self.listbox.insert(tk.END, filename)
+            # Adding, removing or renaming a template changes the directory's mtime; editing one in place does not
+            dir_mtime = os.stat(self.app.templates_dir).st_mtime_ns
+            if dir_mtime == self._listed_mtime:
+                return
+            with os.scandir(self.app.templates_dir) as it:
+                names = sorted(e.name for e in it if e.name.endswith(".json") and e.is_file())
+            if self._fill_after is not None:
+                self.after_cancel(self._fill_after)
+                self._fill_after = None
+            self.tree.delete(*self.tree.get_children())
+            self._fill_rows(names, 0)
+            self._listed_mtime = dir_mtime
         except Exception as e:
             self.app.show_error("Template Load Error", f"Failed to load template list: {e}")
 
+    def _fill_rows(self, names, start: int):
+        """Insert one chunk of rows and leave the rest to idle time, so the dialog opens at once"""
+        for name in names[start:start + TEMPLATE_ROWS_PER_CHUNK]:
+            self.tree.insert("", tk.END, iid=name, text=name)
+        start += TEMPLATE_ROWS_PER_CHUNK
+        self._fill_after = self.after_idle(self._fill_rows, names, start) if start < len(names) else None
+
+    def _selected_template(self) -> Optional[str]:
+        selected = self.tree.selection()
+        return selected[0] if selected else None
+
     def create_new(self):
         editor = TemplateEditor(self, self.app)
         self.wait_window(editor)
         self.load_template_list()
 
     def edit_selected(self):
-        selected = self.listbox.curselection()
-        if not selected:
+        template_name = self._selected_template()
+        if not template_name:
             self.app.show_warning("No Selection", "Please select a template to edit.")
             return
-        template_name = self.listbox.get(selected[0])
         editor = TemplateEditor(self, self.app, template_name)
         self.wait_window(editor)
         self.load_template_list()
 
     def delete_selected(self):
-        selected = self.listbox.curselection()
-        if not selected:
+        template_name = self._selected_template()
+        if not template_name:
             self.app.show_warning("No Selection", "Please select a template to delete.")
             return
-        template_name = self.listbox.get(selected[0])
         
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{template_name}'?", parent=self):
             try:
                 os.remove(os.path.join(self.app.templates_dir, template_name))
-                self.load_template_list()
+                # Drop just this row; the list now matches the directory again
+                self.tree.delete(template_name)
+                self._listed_mtime = os.stat(self.app.templates_dir).st_mtime_ns
                 self.app.load_templates()
             except Exception as e:
                 self.app.show_error("Delete Error", f"Failed to delete template: {e}")
 
+    def destroy(self):
+        if self._fill_after is not None:
+            self.after_cancel(self._fill_after)
+            self._fill_after = None
+        super().destroy()
+
 
 class LoadingScreen:
     """A hacker-themed loading screen that appears before the main UI."""
@@ -113,111 +149,187 @@ class LoadingScreen:
         self.canvas = tk.Canvas(self.root, bg="#000000", highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
-        # Load and display the image
-        try:
-            # Get the directory where this file is located
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            assets_dir = os.path.join(current_dir, "..", "assets")
-            image_path = os.path.join(assets_dir, "1.png")
-            
-            # Load and resize the image to fit nicely on screen
-            image = Image.open(image_path)
-            # Resize to about 30% of the canvas size
-            resized_image = image.resize((240, 180), Image.Resampling.LANCZOS)
-            self.photo = ImageTk.PhotoImage(resized_image)
-            
-            # Place the image slightly above the vertical center
-            self.image_id = self.canvas.create_image(400, 250, image=self.photo)
-        except Exception as e:
-            print(f"Could not load image: {e}")
-            self.image_id = None
+        # Draw the matrix first so the title and image, created after it, stack above it;
+        # moving items never changes the stacking order
+        self.font_size = 12
+        self.streams = []
+        self.setup_matrix()
 
         # Create the text below the image
         self.text_id = self.canvas.create_text(
             400, 350, text="Created by Vedant K",
             font=("Courier", 20, "bold"), fill="#00ff00"
         )
-        
-        # Ensure image is behind text if both are present
-        if self.image_id:
-            self.canvas.tag_lower(self.image_id, self.text_id)
 
-        self.glow_color_index = 0
-        self.glow_colors = ["#00ff00", "#33ff33", "#66ff66", "#99ff99", "#66ff66", "#33ff33"]
+        # The image is loaded a frame after the animation starts, so a cold PIL import
+        # or cache rebuild never holds up the first frames
+        self.image_id = None
+        self._image_after = self.root.after(FRAME_MS, self._show_splash_image)
 
-        self.font_size = 12
-        self.streams = []
-        self.setup_matrix()
+        self.glow_colors = ["#00ff00", "#33ff33", "#66ff66", "#99ff99", "#66ff66", "#33ff33"]
+        self._glow_iter = itertools.cycle(self.glow_colors)
+        self._glow_prev = "#00ff00"  # The title's initial fill
 
+        self._tick_after = self._fade_after = None  # Pending after() ids, cancelled on teardown
         self.root.attributes('-alpha', 0.0)
         self.fade_in()
-        self.animate_glow()
-        self.animate_matrix()
+        self._frame = 0
+        self._tick()
 
-        self.root.after(5000, self.fade_out)
+        self._close_after = self.root.after(5000, self.fade_out)
+
+    def _show_splash_image(self):
+        self._image_after = None
+        try:
+            # Get the directory where this file is located
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            assets_dir = os.path.join(current_dir, "..", "assets")
+            image_path = os.path.join(assets_dir, "1.png")
+            
+            self.photo = self._load_splash_image(image_path, os.path.join(assets_dir, ".cache", "1_240x180.png"))
+            
+            # Place the image slightly above the vertical center, behind the text
+            self.image_id = self.canvas.create_image(400, 250, image=self.photo)
+            self.canvas.tag_lower(self.image_id, self.text_id)
+        except Exception as e:
+            print(f"Could not load image: {e}")
+
+    def _load_splash_image(self, image_path: str, cache_path: str):
+        """Load the splash image at 240x180, reusing a pre-resized copy when it is up to date.
+
+        Tk reads the cached PNG natively, so PIL is only imported to (re)build the cache.
+        """
+        try:
+            if os.stat(cache_path).st_mtime_ns >= os.stat(image_path).st_mtime_ns:
+                return tk.PhotoImage(master=self.root, file=cache_path)
+        except (OSError, tk.TclError):
+            pass
+
+        from PIL import Image, ImageTk
+        # Resize to about 30% of the canvas size
+        resized_image = Image.open(image_path).resize((240, 180), Image.Resampling.LANCZOS)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            resized_image.save(cache_path)
+        except OSError:
+            pass  # Caching is best effort; the image is simply resized again next launch
+        return ImageTk.PhotoImage(resized_image, master=self.root)
 
     def get_random_char(self):
-        return chr(random.randint(33, 126))
+        return random.choice(MATRIX_CHARS)
 
     def setup_matrix(self):
+        font = ("Courier", self.font_size)
+        self.line_height = tkfont.Font(root=self.root, font=font).metrics("linespace")
         font_width = self.font_size // 1.5 # Approximate width
+        self._char_slots = []  # (stream, character index, tier) for every character on screen
+        # Per-stream motion state kept in parallel lists, indexed like self.streams
+        self._stream_xs = []
+        self._stream_ys = []
+        self._stream_speeds = []
+        self._stream_wrap_ys = []  # y past which the whole stream is below the window
         for x in range(0, 800, int(font_width)):
             y = random.randint(-600, 0)
             speed = random.randint(2, 6)
             stream_length = random.randint(10, 30)
-            stream = []
-            for i in range(stream_length):
-                char = self.get_random_char()
-                text_id = self.canvas.create_text(x, y - i * self.font_size, text=char, font=("Courier", self.font_size), fill="#00ff00")
-                stream.append(text_id)
-            self.streams.append({"stream": stream, "y": y, "speed": speed, "len": stream_length})
+            chars = random.choices(MATRIX_CHARS, k=stream_length)
+            # One multi-line text item per colour tier instead of one item per character.
+            # Character i sits i lines above y; the head is the last character.
+            segments = [(0, stream_length - 5, "#009900"),                   # Tail
+                        (stream_length - 4, stream_length - 2, "#66ff66"),   # Near the head
+                        (stream_length - 1, stream_length - 1, "#ccffcc")]   # Head of the stream
+            stream = {"items": [], "chars": chars,
+                      "dirty": set()}  # Indices of tier items whose text changed this frame
+            for tier, (lo, hi, color) in enumerate(segments):
+                offset = -hi * self.line_height  # The item's top line is its highest character
+                text_id = self.canvas.create_text(x, y + offset, text=self._segment_text(chars, lo, hi),
+                                                  font=font, fill=color, anchor="n")
+                stream["items"].append((text_id, lo, hi, offset))
+                self._char_slots.extend((stream, i, tier) for i in range(lo, hi + 1))
+            self.streams.append(stream)
+            self._stream_xs.append(x)
+            self._stream_ys.append(y)
+            self._stream_speeds.append(speed)
+            self._stream_wrap_ys.append(600 + stream_length * self.line_height)
+
+    @staticmethod
+    def _segment_text(chars, lo: int, hi: int) -> str:
+        """Characters lo..hi of a stream, top line first"""
+        return "\n".join(reversed(chars[lo:hi + 1]))
 
     def animate_matrix(self):
-        for s in self.streams:
-            s["y"] += s["speed"]
-            if s["y"] - s["len"] * self.font_size > 600:
-                s["y"] = random.randint(-600, 0)
-                s["speed"] = random.randint(2, 6)
-
-            for i, text_id in enumerate(s["stream"]):
-                self.canvas.coords(text_id, self.canvas.coords(text_id)[0], s["y"] - i * self.font_size)
-                if i == s["len"] - 1: # Head of the stream
-                    self.canvas.itemconfig(text_id, fill="#ccffcc")
-                elif i > s["len"] - 5: # Near the head
-                    self.canvas.itemconfig(text_id, fill="#66ff66")
-                else:
-                    self.canvas.itemconfig(text_id, fill="#009900")
-                
-                if random.random() < 0.1: # 10% chance to change character
-                    self.canvas.itemconfig(text_id, text=self.get_random_char())
-
-        # Keep main text and image on top of matrix
-        if self.image_id:
-            self.canvas.tag_raise(self.image_id)
-        self.canvas.tag_raise(self.text_id)
-        self.root.after(30, self.animate_matrix)
+        coords = self.canvas.coords
+        itemconfig = self.canvas.itemconfig
+        # Change a fixed number of characters across the whole screen, so the cost per frame
+        # does not grow with the number of columns
+        k = min(MATRIX_MUTATIONS_PER_FRAME, len(self._char_slots))
+        for (s, i, tier), char in zip(random.sample(self._char_slots, k), random.choices(MATRIX_CHARS, k=k)):
+            s["chars"][i] = char
+            s["dirty"].add(tier)
+
+        ys = self._stream_ys = list(map(operator.add, self._stream_ys, self._stream_speeds))
+        for i in [i for i, (y, wrap_y) in enumerate(zip(ys, self._stream_wrap_ys)) if y > wrap_y]:
+            ys[i] = random.randint(-600, 0)
+            self._stream_speeds[i] = random.randint(2, 6)
+
+        for s, x, y in zip(self.streams, self._stream_xs, ys):
+            dirty = s["dirty"]
+            for tier, (text_id, lo, hi, offset) in enumerate(s["items"]):
+                coords(text_id, x, y + offset)
+                if tier in dirty:
+                    itemconfig(text_id, text=self._segment_text(s["chars"], lo, hi))
+            dirty.clear()
 
     def animate_glow(self):
-        color = self.glow_colors[self.glow_color_index]
-        self.canvas.itemconfig(self.text_id, fill=color)
-        self.glow_color_index = (self.glow_color_index + 1) % len(self.glow_colors)
-        self.root.after(200, self.animate_glow)
+        color = next(self._glow_iter)
+        if color != self._glow_prev:
+            self.canvas.itemconfig(self.text_id, fill=color)
+            self._glow_prev = color
+
+    def _tick(self):
+        """Advance the matrix every frame and the title glow every GLOW_EVERY frames"""
+        if not self.root.winfo_exists():
+            return
+        self.animate_matrix()
+        if self._frame % GLOW_EVERY == 0:
+            self.animate_glow()
+        self._frame += 1
+        self._tick_after = self.root.after(FRAME_MS, self._tick)
 
     def fade_in(self):
+        if not self.root.winfo_exists():
+            return
         alpha = self.root.attributes("-alpha")
         if alpha < 1.0:
             alpha += 0.05
             self.root.attributes("-alpha", alpha)
-            self.root.after(20, self.fade_in)
+            self._fade_after = self.root.after(20, self.fade_in)
 
     def fade_out(self):
+        if not self.root.winfo_exists():
+            return
+        if self._tick_after is not None:
+            # The window is fading away; stop animating it and stop any fade-in still running
+            self._cancel_pending()
         alpha = self.root.attributes("-alpha")
         if alpha > 0.0:
             alpha -= 0.05
             self.root.attributes("-alpha", alpha)
-            self.root.after(20, self.fade_out)
+            self._fade_after = self.root.after(20, self.fade_out)
         else:
-            self.root.destroy()
+            self.destroy()
+
+    def destroy(self):
+        """Cancel every pending callback and close the loading screen"""
+        self._cancel_pending()
+        self.root.destroy()
+
+    def _cancel_pending(self):
+        for name in ("_tick_after", "_fade_after", "_close_after", "_image_after"):
+            after_id = getattr(self, name)
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+                setattr(self, name, None)
 
 
 class SettingsPanel(tk.Toplevel):
@@ -232,14 +344,14 @@ class SettingsPanel(tk.Toplevel):
         self.transient(parent)
 
         colors = self.app.themes[self.app.current_theme]
-        self.config(bg=colors["bg"])
+        self.config(bg=colors.bg)
 
         # Create a main frame to hold the notebook with scrollbars
         main_frame = ttk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Create a canvas and scrollbar for the notebook
-        canvas = tk.Canvas(main_frame, bg=colors["bg"], highlightthickness=0)
+        canvas = tk.Canvas(main_frame, bg=colors.bg, highlightthickness=0)
         scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
@@ -256,12 +368,22 @@ class SettingsPanel(tk.Toplevel):
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Bind mousewheel to canvas for scrolling
+        # Wheel events go to the widget under the pointer, so bind the canvas and every
+        # settings widget on it directly rather than grabbing the wheel application-wide
         def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+            if event.num == 4:
+                step = -1
+            elif event.num == 5:
+                step = 1
+            else:
+                step = int(-1*(event.delta/120))
+            canvas.yview_scroll(step, "units")
         
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        scrollable_frame.bind("<MouseWheel>", _on_mousewheel)
+        def _bind_mousewheel(widget):
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                widget.bind(sequence, _on_mousewheel, add="+")
+            for child in widget.winfo_children():
+                _bind_mousewheel(child)
         
         # Create notebook inside scrollable frame
         notebook = ttk.Notebook(scrollable_frame)
@@ -310,6 +432,14 @@ class SettingsPanel(tk.Toplevel):
             speed_label.config(text=f"{float(val):.1f}x")
         speed_scale.config(command=update_speed_label)
         
+        # Execution settings
+        execution_frame = ttk.LabelFrame(general_frame, text="Execution")
+        execution_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.async_execution_var = tk.BooleanVar(value=self.app.async_execution)
+        async_check = ttk.Checkbutton(execution_frame, text="Run parallel workflows with asyncio subprocesses", variable=self.async_execution_var)
+        async_check.pack(anchor=tk.W, padx=5, pady=2)
+        
         # Adaptive Interface settings
         adaptive_frame = ttk.LabelFrame(general_frame, text="Adaptive Interface")
         adaptive_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -317,6 +447,8 @@ class SettingsPanel(tk.Toplevel):
         self.adaptive_var = tk.BooleanVar(value=self.app.adaptive_interface_enabled)
         adaptive_check = ttk.Checkbutton(adaptive_frame, text="Enable Adaptive Neural Interface", variable=self.adaptive_var)
         adaptive_check.pack(anchor=tk.W, padx=5, pady=2)
+        
+        _bind_mousewheel(canvas)
 
         button_frame = ttk.Frame(self)
         button_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -329,6 +461,7 @@ class SettingsPanel(tk.Toplevel):
         self.app.autosave_interval = self.autosave_interval_var.get() * 1000
         self.app.animation_enabled = self.animation_var.get()
         self.app.animation_speed = self.animation_speed_var.get()
+        self.app.async_execution = self.async_execution_var.get()
         self.app.adaptive_interface_enabled = self.adaptive_var.get()
         self.app.set_theme(self.theme_var.get())
         self.app.save_settings()
@@ -6,10 +6,10 @@ Contains WorkflowEditor and TemplateEditor classes.
 import tkinter as tk
 import tkinter.scrolledtext as scrolledtext
 from tkinter import ttk
-import json
 import os
 from typing import Optional
 
+import serialization
 from models import WorkflowStep, Workflow
 
 
@@ -27,7 +27,7 @@ class WorkflowEditor(tk.Toplevel):
         self.transient(parent)
         
         colors = self.app.themes[self.app.current_theme]
-        self.config(bg=colors["bg"])
+        self.config(bg=colors.bg)
         
         notebook = ttk.Notebook(self)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -95,8 +95,8 @@ class WorkflowEditor(tk.Toplevel):
         self.step.condition_type = self.condition_type_var.get()
         self.step.condition_expression = self.condition_expr_text.get("1.0", tk.END).strip()
         self.step.notes = self.notes_text.get("1.0", tk.END).strip()
-        self.app.update_workflow_display()
-        self.destroy()
+        self.app.mark_dirty(self.step.id)
+        self.destroy()  # The caller refreshes the display once the editor closes
 
 
 class TemplateEditor(tk.Toplevel):
@@ -112,11 +112,11 @@ class TemplateEditor(tk.Toplevel):
         self.transient(parent)
 
         colors = self.app.themes[self.app.current_theme]
-        self.config(bg=colors["bg"])
+        self.config(bg=colors.bg)
 
         self.text_widget = scrolledtext.ScrolledText(self, wrap=tk.WORD, undo=True)
         self.text_widget.pack(expand=True, fill=tk.BOTH, padx=10, pady=5)
-        self.text_widget.config(bg=colors["widget_bg"], fg=colors["widget_fg"], insertbackground=colors["fg"])
+        self.text_widget.config(bg=colors.widget_bg, fg=colors.widget_fg, insertbackground=colors.fg)
 
         if template_name:
             try:
@@ -134,9 +134,9 @@ class TemplateEditor(tk.Toplevel):
         ttk.Button(button_frame, text="Cancel", command=self.destroy).pack(side=tk.RIGHT)
 
     def save_template(self):
-        content = self.text_widget.get("1.0", tk.END)
+        content = self.text_widget.get("1.0", tk.END).encode("utf-8")
         try:
-            data = json.loads(content)
+            data = serialization.loads(content)
             if "name" not in data or not isinstance(data.get("steps"), list):
                 raise ValueError("Template must have a 'name' and a 'steps' list.")
 
@@ -145,15 +145,17 @@ class TemplateEditor(tk.Toplevel):
             if self.template_name and self.template_name != filename:
                 os.remove(os.path.join(self.app.templates_dir, self.template_name))
 
+            # The text parsed, so save it as typed rather than re-serializing it
             save_path = os.path.join(self.app.templates_dir, filename)
-            with open(save_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(save_path, 'wb') as f:
+                f.write(content)
             
             self.app.show_info("Success", "Template saved successfully.")
+            self.app.template_cache.invalidate(filename)
             self.app.load_templates()
             self.destroy()
             
-        except json.JSONDecodeError:
+        except serialization.JSONDecodeError:
             self.app.show_error("Invalid JSON", "Invalid JSON format.")
         except Exception as e:
             self.app.show_error("Save Error", f"Failed to save template: {e}")
\ No newline at end of file
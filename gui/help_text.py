@@ -0,0 +1,253 @@
+"""
+Help text for the Workflow Generator application.
+Contains the pages of the workflow JSON format guide.
+"""
+
+HELP_OVERVIEW = """
+Workflow Structure
+==================
+
+A workflow is a JSON object that defines a sequence of steps to execute. Each workflow consists of:
+
+• Metadata (name, description, author, etc.)
+• Global settings (execution mode, timeouts, environment variables)
+• A list of steps to execute
+
+Basic Workflow Structure:
+------------------------
+{
+  "name": "Workflow Name",
+  "description": "Brief description",
+  "version": "1.0",
+  "author": "Your Name",
+  "tags": ["tag1", "tag2"],
+  "execution_mode": "sequential",  // or "parallel"
+  "global_timeout": 3600,
+  "global_env_vars": {},
+  "steps": [...]
+}
+
+Key Concepts:
+------------
+1. Variables: Use {VARIABLE_NAME} syntax in commands
+2. Dependencies: Control execution order between steps
+3. Environment Variables: Set per-step or globally
+4. File Management: Define inputs and outputs for each step
+"""
+
+HELP_WORKFLOW_FIELDS = """
+Workflow-Level Fields
+=====================
+
+Required Fields:
+----------------
+• name (string): The name of your workflow
+• steps (array): Array of step objects to execute
+
+Optional Fields:
+----------------
+• description (string): Detailed description of the workflow
+• version (string): Version number (default: "1.0")
+• author (string): Creator of the workflow
+• tags (array): List of tags for categorization
+• execution_mode (string): "sequential" or "parallel" (default: "sequential")
+• global_timeout (integer): Maximum execution time in seconds (default: 3600)
+• global_env_vars (object): Environment variables available to all steps
+• created_at (string): ISO timestamp (auto-generated)
+• modified_at (string): ISO timestamp (auto-generated)
+
+Example:
+--------
+{
+  "name": "Subdomain Enumeration",
+  "description": "Discover subdomains using multiple tools",
+  "version": "1.0",
+  "author": "Security Team",
+  "tags": ["recon", "subdomain", "enumeration"],
+  "execution_mode": "sequential",
+  "global_timeout": 7200,
+  "global_env_vars": {
+    "TARGET": "example.com",
+    "OUTPUT_DIR": "/tmp/recon"
+  }
+}
+"""
+
+HELP_STEP_FIELDS = """
+Step Object Fields
+==================
+
+Required Fields:
+----------------
+• name (string): Descriptive name for the step
+• command (string): Shell command to execute
+
+Optional Fields:
+----------------
+• id (string): Unique identifier (auto-generated if not provided)
+• description (string): Detailed explanation of what the step does
+• working_directory (string): Directory to execute the command in
+• environment_vars (object): Step-specific environment variables
+• input_files (array): List of file paths required by this step
+• output_files (array): List of file paths produced by this step
+• timeout (integer): Maximum execution time in seconds (default: 300)
+• retry_count (integer): Number of retry attempts on failure (default: 0)
+• dependencies (array): List of step IDs that must complete before this one
+• enabled (boolean): Whether to execute this step (default: true)
+• step_type (string): Type of step - "shell", "python", or "docker" (default: "shell")
+• custom_script (string): Custom code for python/docker steps
+• notes (string): Additional notes about the step
+• pos_x, pos_y (integers): Canvas position coordinates
+
+Example Step:
+-------------
+{
+  "name": "Subfinder Scan",
+  "description": "Use subfinder to discover subdomains",
+  "command": "subfinder -d {TARGET} -o {OUTPUT_DIR}/subfinder.txt",
+  "working_directory": "{OUTPUT_DIR}",
+  "environment_vars": {
+    "SUBFINDER_TIMEOUT": "300"
+  },
+  "input_files": [],
+  "output_files": ["{OUTPUT_DIR}/subfinder.txt"],
+  "timeout": 600,
+  "retry_count": 1,
+  "dependencies": [],
+  "enabled": true,
+  "step_type": "shell",
+  "notes": "Requires subfinder to be installed"
+}
+"""
+
+HELP_EXAMPLE = """
+Complete Workflow Example
+=========================
+
+{
+  "name": "Web Application Recon",
+  "description": "Comprehensive web application reconnaissance workflow",
+  "version": "1.0",
+  "author": "Bug Bounty Hunter",
+  "tags": ["web", "recon", "enumeration"],
+  "execution_mode": "sequential",
+  "global_timeout": 10800,
+  "global_env_vars": {
+    "TARGET": "example.com",
+    "OUTPUT_DIR": "/tmp/web_recon"
+  },
+  "steps": [
+    {
+      "id": "step1",
+      "name": "Subdomain Enumeration",
+      "description": "Discover subdomains using subfinder",
+      "command": "subfinder -d {TARGET} -o {OUTPUT_DIR}/subdomains.txt",
+      "working_directory": "{OUTPUT_DIR}",
+      "environment_vars": {},
+      "input_files": [],
+      "output_files": ["{OUTPUT_DIR}/subdomains.txt"],
+      "timeout": 600,
+      "retry_count": 1,
+      "dependencies": [],
+      "enabled": true,
+      "step_type": "shell",
+      "custom_script": "",
+      "notes": "Requires subfinder tool",
+      "pos_x": 50,
+      "pos_y": 50
+    },
+    {
+      "id": "step2",
+      "name": "HTTP Probing",
+      "description": "Check which subdomains are alive",
+      "command": "httpx -l {OUTPUT_DIR}/subdomains.txt -o {OUTPUT_DIR}/alive.txt",
+      "working_directory": "{OUTPUT_DIR}",
+      "environment_vars": {},
+      "input_files": ["{OUTPUT_DIR}/subdomains.txt"],
+      "output_files": ["{OUTPUT_DIR}/alive.txt"],
+      "timeout": 900,
+      "retry_count": 1,
+      "dependencies": ["step1"],
+      "enabled": true,
+      "step_type": "shell",
+      "custom_script": "",
+      "notes": "Requires httpx tool",
+      "pos_x": 300,
+      "pos_y": 50
+    },
+    {
+      "id": "step3",
+      "name": "Screenshot Capture",
+      "description": "Take screenshots of alive subdomains",
+      "command": "aquatone -hosts {OUTPUT_DIR}/alive.txt -out {OUTPUT_DIR}/aquatone",
+      "working_directory": "{OUTPUT_DIR}",
+      "environment_vars": {},
+      "input_files": ["{OUTPUT_DIR}/alive.txt"],
+      "output_files": ["{OUTPUT_DIR}/aquatone"],
+      "timeout": 1200,
+      "retry_count": 0,
+      "dependencies": ["step2"],
+      "enabled": true,
+      "step_type": "shell",
+      "custom_script": "",
+      "notes": "Requires aquatone tool",
+      "pos_x": 550,
+      "pos_y": 50
+    }
+  ]
+}
+"""
+
+HELP_TIPS = """
+Tips & Best Practices
+=====================
+
+1. Variable Usage:
+   • Use {VARIABLE_NAME} syntax for dynamic values
+   • Define global variables in global_env_vars
+   • Use step-specific variables in environment_vars
+
+2. Dependencies:
+   • Use step IDs in dependencies array
+   • Ensure no circular dependencies
+   • Sequential mode executes steps in order
+   • Parallel mode executes independent steps concurrently
+
+3. Error Handling:
+   • Set appropriate timeout values
+   • Use retry_count for flaky steps
+   • Disable experimental steps with enabled: false
+   • Add notes for troubleshooting
+
+4. File Management:
+   • Specify input_files for dependency tracking
+   • List output_files for cleanup/reference
+   • Use consistent directory structure
+
+5. Organization:
+   • Use descriptive names and descriptions
+   • Group related steps together
+   • Add tags for categorization
+   • Include version information
+
+6. Security:
+   • Avoid hardcoding sensitive information
+   • Use environment variables for secrets
+   • Validate file paths
+   • Limit working directories
+
+7. Testing:
+   • Use dry run feature to validate workflows
+   • Test with simple commands first
+   • Validate JSON syntax before saving
+   • Use templates for common workflows
+"""
+
+# (tab title, page text) in display order
+HELP_TABS = (
+    ("Overview", HELP_OVERVIEW),
+    ("Workflow Fields", HELP_WORKFLOW_FIELDS),
+    ("Step Fields", HELP_STEP_FIELDS),
+    ("Complete Example", HELP_EXAMPLE),
+    ("Tips & Best Practices", HELP_TIPS),
+)
@@ -5,13 +5,14 @@ Contains Enums, dataclasses, and supporting structures.
 
 import uuid
 from datetime import datetime
+from functools import cached_property
 from enum import Enum
-from dataclasses import dataclass, asdict, field
+from dataclasses import MISSING, dataclass, field, fields, replace
 from typing import Dict, List, Optional, Any
 
 
-class StepStatus(Enum):
-    """Enumeration of possible step execution statuses."""
+class StepStatus:
+    """Possible step execution statuses, stored as plain strings on ExecutionResult."""
     PENDING = "pending"
     RUNNING = "running"
     SUCCESS = "success"
@@ -26,7 +27,7 @@ class ExecutionMode(Enum):
     PARALLEL = "parallel"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowStep:
     """Represents a single step in a workflow."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -54,8 +55,32 @@ class WorkflowStep:
     pos_y: int = 50
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert the step to a dictionary representation."""
-        return asdict(self)
+        """Convert the step to a dictionary representation.
+        
+        Built by hand rather than with asdict(), which recursively deep-copies every field;
+        the containers only hold strings, so shallow copies are enough.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "command": self.command,
+            "working_directory": self.working_directory,
+            "environment_vars": dict(self.environment_vars),
+            "input_files": list(self.input_files),
+            "output_files": list(self.output_files),
+            "timeout": self.timeout,
+            "retry_count": self.retry_count,
+            "dependencies": list(self.dependencies),
+            "enabled": self.enabled,
+            "step_type": self.step_type,
+            "custom_script": self.custom_script,
+            "notes": self.notes,
+            "condition_type": self.condition_type,
+            "condition_expression": self.condition_expression,
+            "pos_x": self.pos_x,
+            "pos_y": self.pos_y,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WorkflowStep':
@@ -66,6 +91,16 @@ class WorkflowStep:
         if 'condition_expression' not in data:
             data['condition_expression'] = ''
         return cls(**data)
+    
+    def clone(self) -> 'WorkflowStep':
+        """Return a copy of the step with its own containers."""
+        return replace(
+            self,
+            environment_vars=dict(self.environment_vars),
+            input_files=list(self.input_files),
+            output_files=list(self.output_files),
+            dependencies=list(self.dependencies),
+        )
 
 
 @dataclass 
@@ -84,34 +119,181 @@ class Workflow:
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     modified_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert the workflow to a dictionary representation."""
-        data = asdict(self)
-        data['execution_mode'] = self.execution_mode.value
+    def to_dict(self, step_cache: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Convert the workflow to a dictionary representation.
+        
+        If step_cache is given, already serialized steps are reused from it and
+        newly serialized ones are stored in it, keyed by step id.
+        """
+        if step_cache is None:
+            steps = [step.to_dict() for step in self.steps]
+        else:
+            steps = []
+            for step in self.steps:
+                step_data = step_cache.get(step.id)
+                if step_data is None:
+                    step_data = step_cache[step.id] = step.to_dict()
+                steps.append(step_data)
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "version": self.version,
+            "author": self.author,
+            "tags": list(self.tags),
+            "steps": steps,
+            "execution_mode": self.execution_mode.value,
+            "global_timeout": self.global_timeout,
+            "global_env_vars": dict(self.global_env_vars),
+            "created_at": self.created_at,
+            "modified_at": self.modified_at,
+        }
+        if step_cache is None:
+            return data
+        
+        # Drop entries for steps that no longer exist
+        if len(step_cache) > len(self.steps):
+            live_ids = {step.id for step in self.steps}
+            for step_id in [k for k in step_cache if k not in live_ids]:
+                del step_cache[step_id]
         return data
     
+    @property
+    def edit_version(self) -> int:
+        """Counter bumped by touch() whenever the workflow is edited."""
+        return self.__dict__.get('_edit_version', 0)
+    
+    def touch(self):
+        """Record an edit so caches keyed on edit_version are refreshed."""
+        self._edit_version = self.edit_version + 1
+    
+    def step_by_id(self, step_id: str) -> Optional[WorkflowStep]:
+        """Return the step with the given id, or None."""
+        return self._step_index()[3].get(step_id)
+    
+    def step_position(self, step_id: str) -> Optional[int]:
+        """Return the index of the step with the given id in steps, or None."""
+        return self._step_index()[4].get(step_id)
+    
+    def step_ids_by_name(self) -> Dict[str, str]:
+        """Map of step names to step ids, rebuilt only after an edit or a change to the steps list.
+        
+        The returned dict is shared; do not modify it.
+        """
+        key = (self.edit_version, self.steps, len(self.steps))
+        cached = self.__dict__.get('_names_index')
+        if cached is None or cached[0] != key[0] or cached[1] is not key[1] or cached[2] != key[2]:
+            cached = self._names_index = key + ({step.name: step.id for step in self.steps},)
+        return cached[3]
+    
+    def _step_index(self):
+        # Kept outside the dataclass fields (like _edit_version) so it never reaches to_dict() or clone().
+        # Rebuilt after any touch() (reorders, replaced or re-identified steps) or a change to the steps list.
+        index = self.__dict__.get('_steps_index')
+        steps = self.steps
+        version = self.edit_version
+        if index is None or index[0] != version or index[1] is not steps or index[2] != len(steps):
+            by_id = {}
+            positions = {}
+            for i, step in enumerate(steps):
+                by_id[step.id] = step
+                positions[step.id] = i
+            index = self._steps_index = (version, steps, len(steps), by_id, positions)
+        return index
+    
+    def clone(self) -> 'Workflow':
+        """Return a copy of the workflow without a dict round-trip."""
+        return replace(
+            self,
+            tags=list(self.tags),
+            steps=[step.clone() for step in self.steps],
+            global_env_vars=dict(self.global_env_vars),
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Workflow':
         """Create a Workflow from a dictionary."""
         if 'execution_mode' in data and isinstance(data['execution_mode'], str):
-            try:
-                data['execution_mode'] = ExecutionMode(data['execution_mode'])
-            except ValueError:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Invalid execution mode '{data['execution_mode']}' in template. Defaulting to sequential.")
-                data['execution_mode'] = ExecutionMode.SEQUENTIAL
+            data['execution_mode'] = _parse_execution_mode(data['execution_mode'])
         steps_data = data.pop('steps', [])
         workflow = cls(**data)
         workflow.steps = [WorkflowStep.from_dict(step) for step in steps_data]
         return workflow
+    
+    @classmethod
+    def from_dict_fast(cls, data: Dict[str, Any]) -> 'Workflow':
+        """Create a Workflow from a dictionary without running the dataclass __init__s.
+        
+        Falls back to from_dict for any dictionary (or step) with keys that are not fields,
+        so the result and the errors raised match from_dict. Unlike from_dict, data is not modified.
+        """
+        workflow = _new_from_fields(cls, data, exclude='steps')
+        if workflow is None:
+            return cls.from_dict(data)
+        if isinstance(workflow.execution_mode, str):
+            workflow.execution_mode = _parse_execution_mode(workflow.execution_mode)
+        steps = []
+        for step_data in data.get('steps', []):
+            step = _new_from_fields(WorkflowStep, step_data)
+            steps.append(step if step is not None else WorkflowStep.from_dict(step_data))
+        workflow.steps = steps
+        return workflow
+
+
+_EXEC_MODE_MAP: Dict[str, ExecutionMode] = {m.value: m for m in ExecutionMode}
+
+
+def _parse_execution_mode(value: str) -> ExecutionMode:
+    mode = _EXEC_MODE_MAP.get(value)
+    if mode is None:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"Invalid execution mode '{value}' in template. Defaulting to sequential.")
+        return ExecutionMode.SEQUENTIAL
+    return mode
+
+
+_FIELD_SPECS: Dict[type, tuple] = {}  # dataclass -> ((name, default, default_factory), ...)
+
+
+def _new_from_fields(cls, data: Dict[str, Any], exclude: str = ''):
+    """Instantiate dataclass cls from data by filling its __dict__ or slots directly.
+    
+    Returns None if data has unknown keys or lacks a required field.
+    """
+    spec = _FIELD_SPECS.get(cls)
+    if spec is None:
+        spec = _FIELD_SPECS[cls] = tuple((f.name, f.default, f.default_factory) for f in fields(cls))
+    values = {}
+    known = 0
+    for name, default, factory in spec:
+        if name in data:
+            known += 1
+            if name != exclude:
+                values[name] = data[name]
+                continue
+        if default is not MISSING:
+            values[name] = default
+        elif factory is not MISSING:
+            values[name] = factory()
+        else:
+            return None
+    if known < len(data):
+        return None  # Unknown keys; let the regular constructor raise
+    obj = object.__new__(cls)
+    if '__slots__' in cls.__dict__:
+        for name, value in values.items():
+            object.__setattr__(obj, name, value)
+    else:
+        obj.__dict__.update(values)
+    return obj
 
 
 @dataclass
 class ExecutionResult:
     """Results from executing a workflow step."""
     step_id: str
-    status: StepStatus
+    status: str  # One of the StepStatus constants
     start_time: str
     end_time: str = ""
     stdout: str = ""
@@ -119,12 +301,19 @@ class ExecutionResult:
     exit_code: int = 0
     execution_time: float = 0.0
     error_message: str = ""
+    
+    @cached_property
+    def findings_count(self) -> int:
+        """Number of output lines, counted once when first referenced by a later step"""
+        # For findings_count, we would need to parse the output
+        # For now, we'll just count lines as a simple approximation
+        return self.stdout.count('\n') + 1 if self.stdout else 0
 
 
 @dataclass
 class Particle:
     """Represents a particle in the connection animation."""
-    id: str
+    id: int
     x: float
     y: float
     connection_id: str
@@ -135,13 +324,59 @@ class Particle:
     shape: str  # circle, square, diamond
     activity_type: str  # dns, http, file, generic
     particle_type: str = "data"  # data, guidance, highlight
+    dx_step: float = 0.0  # x distance covered per frame at animation speed 1.0
+    dy_step: float = 0.0  # y distance covered per frame at animation speed 1.0
 
+    def set_path(self, x1: float, y1: float, x2: float, y2: float):
+        """Place the particle on a connection at its current progress and precompute its per-frame steps"""
+        self.x = x1 + (x2 - x1) * self.progress
+        self.y = y1 + (y2 - y1) * self.progress
+        self.dx_step = (x2 - x1) * self.speed
+        self.dy_step = (y2 - y1) * self.speed
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
+class Theme:
+    """Colour palette for the application window, its widgets and the workflow canvas."""
+    bg: str
+    fg: str
+    widget_bg: str
+    widget_fg: str
+    canvas_bg: str
+    node_pending: str
+    node_running: str
+    node_success: str
+    node_failed: str
+    node_skipped: str
+    node_timeout: str
+    node_outline: str
+    node_text: str
+    conn_color: str
+
+
+@dataclass(slots=True)
 class UserInteraction:
     """Represents a user interaction with the application."""
-    timestamp: str
+    timestamp: int  # milliseconds since the epoch
     action: str  # e.g., "step_added", "step_executed", "template_used"
     target: str  # e.g., step name, template name
     context: str  # e.g., "reconnaissance", "exploitation", "reporting"
-    duration: float = 0.0  # Optional: time spent on action
\ No newline at end of file
+    duration: float = 0.0  # Optional: time spent on action
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the interaction to a dictionary without asdict()'s recursive copy."""
+        return {
+            "timestamp": self.timestamp,
+            "action": self.action,
+            "target": self.target,
+            "context": self.context,
+            "duration": self.duration,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UserInteraction':
+        """Create a UserInteraction from a dictionary."""
+        # Older versions stored ISO-8601 strings instead of epoch milliseconds
+        if isinstance(data.get('timestamp'), str):
+            data['timestamp'] = int(datetime.fromisoformat(data['timestamp']).timestamp() * 1000)
+        return cls(**data)
\ No newline at end of file
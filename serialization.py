@@ -0,0 +1,94 @@
+"""
+JSON serialization helpers for the Workflow Generator application.
+Contains dumps/loads wrappers that use orjson when it is installed and
+fall back to the standard library otherwise, plus file helpers that
+transparently zstd-compress large documents.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; large files are then written uncompressed
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+COMPRESS_THRESHOLD = 256 * 1024  # Documents larger than this are compressed by write_json
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+# Reused by write_json's streaming fallback
+_ENCODER = json.JSONEncoder()
+_INDENT_ENCODER = json.JSONEncoder(indent=2)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: str, obj: Any, indent: bool = False, compress_over: Optional[int] = None):
+    """Write obj as JSON to path.
+    
+    If compress_over is given and the encoded document is larger than that many bytes,
+    it is zstd-compressed in place (when zstandard is installed). read_json detects
+    compressed files by their magic bytes, so the path never changes.
+    
+    With orjson the document is encoded in one call; without it, the stdlib encoder's
+    chunks are streamed to disk so the whole document is never held as one string.
+    """
+    compress = compress_over is not None and zstandard is not None
+    if orjson is not None:
+        data = dumps(obj, indent=indent)
+        if compress and len(data) > compress_over:
+            data = zstandard.ZstdCompressor(level=3).compress(data)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+
+    chunks = (chunk.encode("utf-8") for chunk in (_INDENT_ENCODER if indent else _ENCODER).iterencode(obj))
+    with open(path, 'wb') as f:
+        out = f
+        if compress:
+            # Buffer until the threshold is crossed; small documents stay plain
+            head, size = [], 0
+            for chunk in chunks:
+                head.append(chunk)
+                size += len(chunk)
+                if size > compress_over:
+                    out = zstandard.ZstdCompressor(level=3).stream_writer(f, closefd=False)
+                    break
+            for chunk in head:
+                out.write(chunk)
+        for chunk in chunks:
+            out.write(chunk)
+        if out is not f:
+            out.close()  # Finish the zstd frame
+
+
+def read_json(path: str) -> Any:
+    """Read a JSON document written by write_json, decompressing it if needed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed; install 'zstandard' to read it")
+        # decompressobj also handles streamed frames that carry no content size
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return loads(data)
@@ -0,0 +1,182 @@
+"""
+Template cache for the Workflow Generator application.
+Contains the TemplateCache class, which parses template files once and reuses
+the parsed workflows until the files change on disk.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from typing import Any, Dict, Optional, Tuple
+
+import serialization
+from models import Workflow, WorkflowStep
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; stat checks alone keep the cache correct
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = "workflow_generator"  # Per-user cache directory holding the sidecars
+CACHE_FORMAT = 1  # Bump when the sidecar layout changes
+READ_WORKERS = 8  # Threads used to read uncached template files
+MIN_PARALLEL_READS = 4  # Below this many uncached files, plain serial reads are cheaper
+
+Entry = Tuple[int, int, Dict[str, Any], Workflow]  # (mtime_ns, size, parsed JSON, template)
+
+
+def _user_cache_dir() -> str:
+    """The per-user cache directory: %LOCALAPPDATA% on Windows, $XDG_CACHE_HOME or ~/.cache elsewhere."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, CACHE_DIR_NAME)
+
+
+def _cache_version() -> list:
+    """Sidecar format tag; any change to the model fields invalidates existing sidecars."""
+    return [CACHE_FORMAT, [f.name for f in fields(Workflow)], [f.name for f in fields(WorkflowStep)]]
+
+
+class _InvalidateOnChange(FileSystemEventHandler):
+    """Drops cache entries for template files changed behind the app's back."""
+
+    def __init__(self, cache: 'TemplateCache'):
+        self.cache = cache
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path and path.endswith(".json"):
+                self.cache.invalidate(os.path.basename(path))
+
+
+class TemplateCache:
+    """Parsed templates keyed by filename and validated against each file's mtime and size.
+
+    The parsed JSON of each template is persisted in a sidecar in the per-user cache
+    directory, so the next launch reads one file instead of every unchanged template.
+    If watchdog is installed, the directory is also watched and edited files are
+    invalidated as soon as they change.
+    Safe to use from the background loader thread and the Tk thread.
+    """
+
+    def __init__(self, templates_dir: str, watch: bool = True):
+        self.templates_dir = templates_dir
+        key = hashlib.sha1(os.path.abspath(templates_dir).encode("utf-8")).hexdigest()[:16]
+        self._sidecar_path = os.path.join(_user_cache_dir(), f"templates-{key}.json")
+        self._entries: Optional[Dict[str, Entry]] = None  # Loaded from the sidecar on first use
+        self._lock = threading.Lock()
+        self._observer = None
+        if watch and Observer is not None:
+            try:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.schedule(_InvalidateOnChange(self), templates_dir, recursive=False)
+                self._observer.start()
+            except Exception as e:
+                logger.warning(f"Not watching the templates directory: {e}")
+                self._observer = None
+
+    def invalidate(self, filename: str):
+        """Forget the cached template for filename."""
+        with self._lock:
+            if self._entries is not None:
+                self._entries.pop(filename, None)
+
+    def load_all(self) -> Tuple[Dict[str, Workflow], Optional[str]]:
+        """Parse every template in the directory, reusing unchanged entries.
+
+        Returns (templates by workflow name, error message or None).
+        """
+        with self._lock:
+            old_entries = dict(self._load_entries())
+        templates = {}
+        entries = {}
+        error = None
+        changed = False
+        try:
+            with os.scandir(self.templates_dir) as it:
+                files = sorted((e for e in it if e.name.endswith(".json") and e.is_file()), key=lambda e: e.name)
+            stats = [(entry, entry.stat()) for entry in files]
+            misses = [entry.path for entry, st in stats
+                      if old_entries.get(entry.name, ())[:2] != (st.st_mtime_ns, st.st_size)]
+
+            # Issue the reads for uncached files concurrently so a cold start overlaps their I/O
+            if len(misses) >= MIN_PARALLEL_READS:
+                with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(misses))) as pool:
+                    raw = dict(zip(misses, pool.map(self._read_file_bytes, misses)))
+            else:
+                raw = {path: self._read_file_bytes(path) for path in misses}
+
+            for entry, st in stats:
+                if entry.path in raw:
+                    data = serialization.loads(raw[entry.path])
+                    workflow = Workflow.from_dict_fast(data)
+                    changed = True
+                else:
+                    _, _, data, workflow = old_entries[entry.name]
+                entries[entry.name] = (st.st_mtime_ns, st.st_size, data, workflow)
+                templates[workflow.name] = workflow
+        except Exception as e:
+            error = f"Failed to load templates: {e}"
+
+        if error is None:
+            with self._lock:
+                self._entries = entries
+            if changed or entries.keys() != old_entries.keys():
+                self._write_sidecar(entries)
+        return templates, error
+
+    def close(self):
+        """Stop watching the templates directory."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+    @staticmethod
+    def _read_file_bytes(path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _load_entries(self) -> Dict[str, Entry]:
+        # Caller holds self._lock
+        if self._entries is None:
+            self._entries = self._read_sidecar()
+        return self._entries
+
+    def _read_sidecar(self) -> Dict[str, Entry]:
+        """Load the sidecar, or an empty cache if it is missing, unreadable or from another format"""
+        try:
+            with open(self._sidecar_path, 'rb') as f:
+                sidecar = serialization.loads(f.read())
+            if not isinstance(sidecar, dict) or sidecar.get("version") != _cache_version():
+                return {}
+            return {name: (mtime_ns, size, data, Workflow.from_dict_fast(data))
+                    for name, (mtime_ns, size, data) in sidecar["entries"].items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable template cache: {e}")
+            return {}
+
+    def _write_sidecar(self, entries: Dict[str, Entry]):
+        sidecar = {
+            "version": _cache_version(),
+            "entries": {name: [mtime_ns, size, data] for name, (mtime_ns, size, data, _) in entries.items()},
+        }
+        tmp_path = self._sidecar_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self._sidecar_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(serialization.dumps(sidecar))
+            os.replace(tmp_path, self._sidecar_path)
+        except Exception as e:
+            logger.error(f"Failed to write template cache: {e}")
@@ -3,7 +3,13 @@ Workflow execution engine for the Workflow Generator application.
 Contains the VariableResolver and WorkflowRunner classes.
 """
 
+import ast
+import asyncio
 import os
+import re
+import selectors
+import shlex
+import signal
 import subprocess
 import time
 import logging
@@ -11,7 +17,9 @@ import shutil
 import queue
 import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Callable, Any
+from functools import cached_property, lru_cache
+from types import CodeType
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, wait
 
@@ -19,86 +27,202 @@ from models import WorkflowStep, Workflow, ExecutionResult, StepStatus, Executio
 
 logger = logging.getLogger(__name__)
 
+# Steps mostly wait on their subprocesses, so allow a couple of workers per core
+DEFAULT_PARALLEL_STEPS = max(4, (os.cpu_count() or 4) * 2)
+READ_CHUNK = 64 * 1024  # Bytes read from a step's stdout/stderr at a time
+SPAWN_POLL_S = 0.005  # Async wait between attempts to take a launch slot
+_SHELL_SYNTAX = frozenset("|&;<>()$`*?[]{}~#\n")  # Characters that need /bin/sh to interpret them
+
+_PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')  # {name} and {step.property} references
+_CONDITION_TOKEN_RE = re.compile(r"""('[^']*'|"[^"]*")|\{([^}]+)\}""")  # String literal or placeholder
+
+# Syntax a condition may use: comparisons, boolean logic and arithmetic on literals and values.
+# Attribute access, calls, subscripts and the like are rejected before anything is evaluated.
+_CONDITION_NODES = (
+    ast.Expression, ast.Compare, ast.BoolOp, ast.UnaryOp, ast.BinOp, ast.IfExp,
+    ast.Constant, ast.Name, ast.Load, ast.Tuple, ast.List, ast.Set,
+    ast.cmpop, ast.boolop, ast.unaryop, ast.operator,
+)
+
+
+def _safe_compile(expression: str) -> CodeType:
+    """Compile a condition expression after checking it only uses _CONDITION_NODES"""
+    tree = ast.parse(expression, "<condition>", mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _CONDITION_NODES):
+            raise ValueError(f"Unsupported syntax in condition: {type(node).__name__}")
+    return compile(tree, "<condition>", "eval")
+
+
+@lru_cache(maxsize=256)
+def _compile_condition(expression: str) -> CodeType:
+    """Compile a resolved condition expression; repeated runs mostly resolve to the same few strings"""
+    return _safe_compile(expression)
+
+
+@lru_cache(maxsize=256)
+def _compile_condition_template(expression: str) -> Optional[Tuple[CodeType, Tuple[str, ...]]]:
+    """Compile a condition with its placeholders turned into the locals _v0, _v1, ...
+
+    Returns (code, placeholder names by local index), or None if the expression only
+    makes sense after text substitution, i.e. it has placeholders inside string literals
+    or does not compile once they are replaced.
+    """
+    names: List[str] = []
+    textual = False
+
+    def to_local(match):
+        nonlocal textual
+        literal, var = match.groups()
+        if literal is not None:
+            textual = textual or _PLACEHOLDER_RE.search(literal) is not None
+            return literal
+        if var not in names:
+            names.append(var)
+        return f"_v{names.index(var)}"
+
+    rewritten = _CONDITION_TOKEN_RE.sub(to_local, expression)
+    if textual:
+        return None
+    try:
+        return _safe_compile(rewritten), tuple(names)
+    except SyntaxError:
+        return None
+
+
+def _command_args(command: str):
+    """Return (args, shell) for Popen: a plain argument list when the command uses no shell syntax"""
+    if os.name == "nt" or not _SHELL_SYNTAX.isdisjoint(command):
+        return command, True
+    try:
+        args = shlex.split(command)
+    except ValueError:  # Unbalanced quotes; let the shell report it
+        return command, True
+    if not args or "=" in args[0]:  # Empty, or a VAR=value prefix
+        return command, True
+    return args, False
+
 
 class VariableResolver:
     """Handles variable substitution in commands and paths."""
     
     def __init__(self, global_vars: Dict[str, str], step_vars: Dict[str, str], 
                  execution_results: Optional[Dict[str, ExecutionResult]] = None, 
-                 workflow_steps: Optional[List[WorkflowStep]] = None):
+                 workflow_steps: Optional[List[WorkflowStep]] = None,
+                 workflow: Optional[Workflow] = None):
         self.variables = {**global_vars, **step_vars}
-        self.execution_results = execution_results or {}
-        self.workflow_steps = workflow_steps or []
-        self.step_id_to_name = {step.id: step.name for step in self.workflow_steps}
-        self.step_name_to_id = {step.name: step.id for step in self.workflow_steps}
+        # The runner's results dict is shared, not copied, so results recorded later are visible
+        self.execution_results = execution_results if execution_results is not None else {}
+        # Given a workflow, its cached step lookups are reused instead of being rebuilt for every run
+        self.workflow = workflow
+        self.workflow_steps = workflow.steps if workflow is not None else (workflow_steps or [])
+        self._positions: Optional[Dict[str, int]] = None  # Built on first use without a workflow
+        self._cache: Dict[tuple, str] = {}  # (text, current_step_id, results seen) -> resolved text
     
     def resolve(self, text: str, current_step_id: Optional[str] = None) -> str:
-        """Replace variables in text with their values."""
-        resolved = text
-        
-        # Handle special variables like {previous_step.exit_code}
-        import re
-        special_vars = re.findall(r'\{([^}]+)\}', text)
-        
-        for var in special_vars:
-            if '.' in var and var not in self.variables:
-                parts = var.split('.', 1)
-                step_ref = parts[0]
-                property_name = parts[1]
-                
-                # Handle previous_step reference
-                if step_ref == "previous_step" and current_step_id and self.workflow_steps:
-                    # Find the previous step in the workflow
-                    step_ids = [step.id for step in self.workflow_steps]
-                    if current_step_id in step_ids:
-                        current_index = step_ids.index(current_step_id)
-                        if current_index > 0:
-                            previous_step_id = step_ids[current_index - 1]
-                            if previous_step_id in self.execution_results:
-                                result = self.execution_results[previous_step_id]
-                                if property_name == "exit_code":
-                                    resolved = resolved.replace(f"{{{var}}}", str(result.exit_code))
-                                elif property_name == "findings_count":
-                                    # For findings_count, we would need to parse the output
-                                    # For now, we'll just count lines as a simple approximation
-                                    findings_count = len(result.stdout.split('\n')) if result.stdout else 0
-                                    resolved = resolved.replace(f"{{{var}}}", str(findings_count))
-                                elif property_name == "status":
-                                    resolved = resolved.replace(f"{{{var}}}", result.status.value)
-                                    
-                # Handle step_name.property reference
-                if step_ref in self.step_name_to_id:
-                    step_id = self.step_name_to_id[step_ref]
-                    if step_id in self.execution_results:
-                        result = self.execution_results[step_id]
-                        if property_name == "exit_code":
-                            resolved = resolved.replace(f"{{{var}}}", str(result.exit_code))
-                        elif property_name == "findings_count":
-                            # For findings_count, we would need to parse the output
-                            # For now, we'll just count lines as a simple approximation
-                            findings_count = len(result.stdout.split('\n')) if result.stdout else 0
-                            resolved = resolved.replace(f"{{{var}}}", str(findings_count))
-                        elif property_name == "status":
-                            resolved = resolved.replace(f"{{{var}}}", result.status.value)
-                            
-        # Handle regular variables
-        for key, value in self.variables.items():
-            resolved = resolved.replace(f"{{{key}}}", str(value))
+        """Replace variables in text with their values.
+        
+        Every placeholder is substituted in a single pass; unknown ones are left as they are.
+        Results are memoized until another step result is recorded.
+        """
+        if not text or "{" not in text:
+            return text  # Nothing to substitute
+        # A run only ever adds finished results, so their count identifies what text could resolve to
+        key = (text, current_step_id, len(self.execution_results))
+        resolved = self._cache.get(key)
+        if resolved is None:
+            resolved = self._cache[key] = _PLACEHOLDER_RE.sub(self._substitution(current_step_id), text)
         return resolved
     
+    @cached_property
+    def step_name_to_id(self) -> Dict[str, str]:
+        if self.workflow is not None:
+            return self.workflow.step_ids_by_name()
+        return {step.name: step.id for step in self.workflow_steps}
+    
+    def _step_position(self, step_id: str) -> Optional[int]:
+        if self.workflow is not None:
+            return self.workflow.step_position(step_id)
+        if self._positions is None:
+            self._positions = {step.id: i for i, step in enumerate(self.workflow_steps)}
+        return self._positions.get(step_id)
+    
+    def _substitution(self, current_step_id: Optional[str]):
+        variables = self.variables
+        
+        def substitute(match):
+            var = match.group(1)
+            if var in variables:
+                return str(variables[var])
+            value = self.special_value(var, current_step_id)
+            return match.group(0) if value is None else str(value)
+        
+        return substitute
+    
+    def special_value(self, var: str, current_step_id: Optional[str] = None) -> Any:
+        """Value of a special variable like {previous_step.exit_code} or {step_name.status}, or None.
+        
+        Exit codes and findings counts are ints and statuses are strings. Names that are
+        also regular variables are not special.
+        """
+        step_ref, dot, property_name = var.partition('.')
+        if not dot or var in self.variables:
+            return None
+        value = None
+        # Handle previous_step reference
+        if step_ref == "previous_step" and current_step_id:
+            current_index = self._step_position(current_step_id)
+            if current_index:
+                value = self._result_property(self.workflow_steps[current_index - 1].id, property_name)
+        # Handle step_name.property reference
+        if value is None and step_ref in self.step_name_to_id:
+            value = self._result_property(self.step_name_to_id[step_ref], property_name)
+        return value
+    
+    def _result_property(self, step_id: str, property_name: str) -> Any:
+        result = self.execution_results.get(step_id)
+        if result is None:
+            return None
+        if property_name == "exit_code":
+            return result.exit_code
+        if property_name == "findings_count":
+            return result.findings_count
+        if property_name == "status":
+            return result.status
+        return None
+    
     def validate_variables(self, text: str) -> List[str]:
         """Find unresolved variables in text."""
-        import re
-        unresolved = re.findall(r'\{([^}]+)\}', text)
-        return [var for var in unresolved if var not in self.variables]
+        # A plain find() scan, matching what _PLACEHOLDER_RE.findall would return
+        variables = self.variables
+        unresolved = []
+        find = text.find
+        start = find("{")
+        while start >= 0:
+            end = find("}", start + 1)
+            if end < 0:
+                break
+            if end > start + 1:  # {} is not a placeholder
+                var = text[start + 1:end]
+                if var not in variables:
+                    unresolved.append(var)
+            start = find("{", end + 1)
+        return unresolved
 
 
 class WorkflowRunner:
     """Executes workflows with proper isolation and monitoring."""
     
-    def __init__(self, dry_run: bool = False, sandbox_dir: Optional[str] = None):
+    def __init__(self, dry_run: bool = False, sandbox_dir: Optional[str] = None, use_asyncio: bool = False):
         self.dry_run = dry_run
         self.sandbox_dir = sandbox_dir or "/tmp/workflow_sandbox"
+        self.use_asyncio = use_asyncio  # Run parallel workflows on an asyncio event loop instead of a thread pool
+        self.max_parallel_steps = DEFAULT_PARALLEL_STEPS
+        self._pool: Optional[ThreadPoolExecutor] = None  # Created on first parallel run, reused afterwards
+        self._which_cache: Dict[str, str] = {}  # command name -> path found on _which_path
+        self._which_path: Optional[str] = None
+        self._base_env: Optional[Dict[str, str]] = None  # os.environ as of the current run's start
+        self._spawn_gate = threading.BoundedSemaphore(os.cpu_count() or 4)  # Concurrent process launches
         self.running = False
         self.current_execution = None
         self.execution_queue = queue.Queue()
@@ -113,28 +237,21 @@ class WorkflowRunner:
             return True
             
         try:
-            # Resolve variables in the condition expression
-            resolved_expression = resolver.resolve(step.condition_expression, step.id)
-            
-            # Simple evaluation of condition expression
-            # This supports basic comparisons like:
+            # Conditions compare step results, e.g.
             # {previous_step.exit_code} == 0
             # {previous_step.findings_count} > 5
             # {step_name.exit_code} != 0
-            
-            # For now, we'll do simple evaluation using Python's eval
-            # In a production environment, you might want a safer expression evaluator
-            # We need to parse the resolved expression to extract values for comparison
-            # For example: "0 == 0" where the first 0 came from {previous_step.exit_code}
-            
-            # Simple approach: if the resolved expression contains "True" or "False"
-            if "True" in resolved_expression and "False" not in resolved_expression:
-                result = True
-            elif "False" in resolved_expression and "True" not in resolved_expression:
-                result = False
+            # Each expression is compiled once with its placeholders as locals and evaluated
+            # against the results' values, so exit codes compare as ints and statuses as strings
+            compiled = _compile_condition_template(step.condition_expression)
+            values = [resolver.special_value(var, step.id) for var in compiled[1]] if compiled else None
+            if compiled and None not in values:
+                result = eval(compiled[0], {"__builtins__": {}}, {f"_v{i}": v for i, v in enumerate(values)})
             else:
-                # Try to evaluate as a boolean expression
-                result = eval(resolved_expression, {"__builtins__": {}}, {})
+                # Regular variables, results not recorded yet, or placeholders inside quotes:
+                # substitute the text and evaluate that instead
+                resolved_expression = resolver.resolve(step.condition_expression, step.id)
+                result = eval(_compile_condition(resolved_expression), {"__builtins__": {}}, {})
             return result if step.condition_type == "if" else not result
         except Exception as e:
             logger.warning(f"Condition evaluation failed for step {step.name}: {e}")
@@ -149,17 +266,42 @@ class WorkflowRunner:
         """Set callback for animation updates."""
         self.animation_callback = callback
     
+    def reset(self):
+        """Clear per-run state so the runner can be reused; the worker pool is kept."""
+        self.results = {}  # A new dict, since callers may still hold the previous run's results
+        self.running = False
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_parallel_steps, thread_name_prefix="workflow-step")
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def __enter__(self) -> 'WorkflowRunner':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def execute_workflow(self, workflow: Workflow, global_vars: Dict[str, str], step_vars: Dict[str, str]) -> Dict[str, ExecutionResult]:
         """Execute a complete workflow."""
-        self.results = {}
+        self.reset()
         self.running = True
+        self._base_env = dict(os.environ)
         
         try:
             self._prepare_sandbox()
-            resolver = VariableResolver(global_vars, step_vars, self.results, workflow.steps)
+            resolver = VariableResolver(global_vars, step_vars, self.results, workflow=workflow)
             
             if workflow.execution_mode == ExecutionMode.SEQUENTIAL:
                 self._execute_sequential(workflow, resolver)
+            elif self.use_asyncio:
+                asyncio.run(self._execute_parallel_async(workflow, resolver))
             else:
                 self._execute_parallel(workflow, resolver)
                 
@@ -193,17 +335,16 @@ class WorkflowRunner:
     def _execute_sequential(self, workflow: Workflow, resolver: VariableResolver):
         """Execute steps sequentially."""
         logger.info("Starting sequential execution of workflow.")
+        succeeded = set()  # Ids of the steps that have run successfully so far
         for i, step in enumerate(workflow.steps):
             logger.info(f"Processing step {i+1}/{len(workflow.steps)}: {step.name}")
             if not step.enabled:
                 logger.info(f"Step {step.name} is disabled, skipping.")
                 continue
 
-            dep_statuses = self._get_dependency_statuses(step.dependencies)
-            logger.info(f"Step {step.name} dependencies statuses: {dep_statuses}")
-
-            # Check if dependencies are met
-            if all(s == StepStatus.SUCCESS for s in dep_statuses):
+            # Dependencies are met once every one of them has succeeded; ones that have not run
+            # yet (later, disabled or missing steps) count as unmet
+            if succeeded.issuperset(step.dependencies):
                 logger.info(f"All dependencies for step {step.name} are met, checking conditions.")
                 
                 # Check conditional execution
@@ -211,7 +352,9 @@ class WorkflowRunner:
                     logger.info(f"Condition for step {step.name} is met, executing.")
                     result = self._execute_step(step, resolver)
                     self.results[step.id] = result
-                    if result.status == StepStatus.FAILED:
+                    if result.status == StepStatus.SUCCESS:
+                        succeeded.add(step.id)
+                    elif result.status == StepStatus.FAILED:
                         logger.error(f"Step {step.name} failed, continuing to next step")
                 else:
                     error_message = f"Skipping {step.name}: Condition not met."
@@ -231,113 +374,180 @@ class WorkflowRunner:
         # Create a mapping of step IDs to steps for easy lookup
         step_map = {step.id: step for step in workflow.steps}
         
-        # Build dependency graph and identify initial ready steps
-        dependency_graph = {step.id: set(step.dependencies) for step in workflow.steps}
+        # Count each step's unfinished dependencies and build the reverse graph
+        # (what steps depend on each step). A step is ready once its count reaches zero;
+        # dependencies that are not in the workflow never succeed, so they keep it waiting.
+        remaining_deps = {step.id: len(set(step.dependencies)) for step in workflow.steps}
         reverse_dependencies = {step.id: set() for step in workflow.steps}
-        
-        # Build reverse dependency graph (what steps depend on each step)
         for step in workflow.steps:
             for dep_id in step.dependencies:
                 if dep_id in reverse_dependencies:
                     reverse_dependencies[dep_id].add(step.id)
         
-        # Find steps with no dependencies (ready to run)
-        ready_steps = [step.id for step in workflow.steps if not step.dependencies]
-        pending_steps = set(step.id for step in workflow.steps)
-        completed_steps = set()
+        pending_steps = set(step_map)
         
-        # Thread pool for execution
-        max_workers = min(10, len(workflow.steps) or 10)  # Limit concurrent threads
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_step = {}
-            
-            # Submit initially ready steps
-            for step_id in ready_steps:
-                if step_id in step_map and step_map[step_id].enabled:
-                    # Check conditional execution before submitting
-                    if self.evaluate_condition(step_map[step_id], resolver):
-                        future = executor.submit(self._execute_step, step_map[step_id], resolver)
-                        future_to_step[future] = step_id
-                        pending_steps.discard(step_id)
-                    else:
-                        # Condition not met, skip the step
-                        error_message = f"Skipping {step_map[step_id].name}: Condition not met."
-                        logger.warning(error_message)
-                        self._skip_step(step_map[step_id], error_message)
-                        pending_steps.discard(step_id)
-                        completed_steps.add(step_id)
-            
+        # Thread pool for execution, kept across runs
+        executor = self._get_pool()
+        future_to_step = {}
+        done_q: "queue.Queue" = queue.Queue()  # Futures put here by the pool as they finish
+        
+        def submit_ready(step_id: str):
+            step = step_map[step_id]
+            if not step.enabled:
+                return
+            pending_steps.discard(step_id)
+            # Check conditional execution before submitting
+            if self.evaluate_condition(step, resolver):
+                future = executor.submit(self._execute_step, step, resolver)
+                future_to_step[future] = step_id
+                future.add_done_callback(done_q.put)
+            else:
+                # Condition not met, skip the step
+                error_message = f"Skipping {step.name}: Condition not met."
+                logger.warning(error_message)
+                self._skip_step(step, error_message)
+                skip_dependents(step_id)
+        
+        def skip_dependents(step_id: str):
+            # Everything downstream of a step that did not succeed can never run; skip it now
+            # rather than after the rest of the workflow has finished
+            to_visit = list(reverse_dependencies[step_id])
+            while to_visit:
+                dependent_id = to_visit.pop()
+                if dependent_id in pending_steps:
+                    pending_steps.discard(dependent_id)
+                    dependent = step_map[dependent_id]
+                    error_message = f"Skipping {dependent.name}: Dependencies not successfully met."
+                    logger.warning(error_message)
+                    self._skip_step(dependent, error_message)
+                    to_visit.extend(reverse_dependencies[dependent_id])
+        
+        # Submit steps with no dependencies
+        for step in workflow.steps:
+            if remaining_deps[step.id] == 0:
+                submit_ready(step.id)
+        
+        try:
             # Process completed steps and submit new ready ones
             while future_to_step:
-                # Wait for at least one future to complete
-                done, _ = wait(future_to_step.keys(), return_when=FIRST_COMPLETED)
+                # Handle steps in the order they finish
+                future = done_q.get()
+                step_id = future_to_step.pop(future)
+                try:
+                    result = future.result()
+                    self.results[step_id] = result
                 
-                # Process completed futures
-                for future in done:
-                    step_id = future_to_step.pop(future)
-                    try:
-                        result = future.result()
+                    if self.status_callback:
+                        self.status_callback(step_id, result.status, f"Step {step_map[step_id].name} completed with status: {result.status}")
+                
+                    # Only a success brings dependents closer to running
+                    if result.status == StepStatus.SUCCESS:
+                        for dependent_id in reverse_dependencies[step_id]:
+                            remaining_deps[dependent_id] -= 1
+                            if remaining_deps[dependent_id] == 0 and dependent_id in pending_steps:
+                                submit_ready(dependent_id)
+                    else:
+                        skip_dependents(step_id)
+                            
+                except Exception as e:
+                    logger.error(f"Error processing step {step_id}: {e}")
+                    # Mark step as failed in results
+                    if step_id not in self.results:
+                        result = ExecutionResult(
+                            step_id=step_id,
+                            status=StepStatus.FAILED,
+                            start_time=datetime.now().isoformat(),
+                            error_message=str(e)
+                        )
                         self.results[step_id] = result
-                        completed_steps.add(step_id)
-                        
-                        if self.status_callback:
-                            self.status_callback(step_id, result.status, f"Step {step_map[step_id].name} completed with status: {result.status.value}")
-                        
-                        # Check if any new steps are ready to run
-                        newly_ready = []
-                        for dependent_id in reverse_dependencies.get(step_id, set()):
-                            # Check if all dependencies of this step are completed
-                            dep_statuses = self._get_dependency_statuses(step_map[dependent_id].dependencies)
-                            if all(s == StepStatus.SUCCESS for s in dep_statuses) and dependent_id in pending_steps:
-                                newly_ready.append(dependent_id)
-                        
-                        # Submit newly ready steps
-                        for new_step_id in newly_ready:
-                            if step_map[new_step_id].enabled:
-                                # Check conditional execution before submitting
-                                if self.evaluate_condition(step_map[new_step_id], resolver):
-                                    future = executor.submit(self._execute_step, step_map[new_step_id], resolver)
-                                    future_to_step[future] = new_step_id
-                                    pending_steps.discard(new_step_id)
-                                else:
-                                    # Condition not met, skip the step
-                                    error_message = f"Skipping {step_map[new_step_id].name}: Condition not met."
-                                    logger.warning(error_message)
-                                    self._skip_step(step_map[new_step_id], error_message)
-                                    pending_steps.discard(new_step_id)
-                                    completed_steps.add(new_step_id)
-                                    
-                    except Exception as e:
-                        logger.error(f"Error processing step {step_id}: {e}")
-                        # Mark step as failed in results
-                        if step_id not in self.results:
-                            result = ExecutionResult(
-                                step_id=step_id,
-                                status=StepStatus.FAILED,
-                                start_time=datetime.now().isoformat(),
-                                error_message=str(e)
-                            )
-                            self.results[step_id] = result
-                            completed_steps.add(step_id)
-        
-        # Handle any steps that couldn't be executed due to failed dependencies
+                    skip_dependents(step_id)
+        finally:
+            # The pool outlives this run, so never return while its steps are still running
+            wait(future_to_step.keys())
+        
+        # Handle any steps left waiting on dependencies that are missing, disabled or in a cycle
         for step_id in pending_steps:
-            step = step_map[step_id]
-            dep_statuses = self._get_dependency_statuses(step.dependencies)
-            if not all(s == StepStatus.SUCCESS for s in dep_statuses):
+            if remaining_deps[step_id]:
+                step = step_map[step_id]
                 error_message = f"Skipping {step.name}: Dependencies not successfully met."
                 logger.warning(error_message)
                 self._skip_step(step, error_message)
         
         logger.info("Finished parallel execution of workflow.")
     
-    def _execute_step(self, step: WorkflowStep, resolver: VariableResolver) -> ExecutionResult:
-        """Execute a single workflow step."""
-        start_time = datetime.now()
+    async def _execute_parallel_async(self, workflow: Workflow, resolver: VariableResolver):
+        """Execute steps concurrently on an asyncio event loop.
+        
+        Each step is a task that waits for its dependencies' tasks, so independent
+        subprocesses run side by side without a thread per step.
+        """
+        logger.info("Starting asyncio parallel execution of workflow.")
+        limit = asyncio.Semaphore(self.max_parallel_steps)
+        tasks: Dict[str, asyncio.Task] = {}
+        succeeded = set()  # Ids of the steps that have run successfully
+
+        async def run(step: WorkflowStep):
+            deps = [tasks[dep_id] for dep_id in step.dependencies if dep_id in tasks]
+            if deps:
+                await asyncio.gather(*deps)
+            if not step.enabled:
+                return
+            if not succeeded.issuperset(step.dependencies):
+                error_message = f"Skipping {step.name}: Dependencies not successfully met."
+                logger.warning(error_message)
+                self._skip_step(step, error_message)
+            elif not self.evaluate_condition(step, resolver):
+                error_message = f"Skipping {step.name}: Condition not met."
+                logger.warning(error_message)
+                self._skip_step(step, error_message)
+            else:
+                async with limit:
+                    result = self.results[step.id] = await self._execute_step_async(step, resolver)
+                if result.status == StepStatus.SUCCESS:
+                    succeeded.add(step.id)
+
+        # Create tasks in dependency order so every task can look up its dependencies' tasks
+        ordered = self._topological_order(workflow.steps)
+        for step in ordered:
+            tasks[step.id] = asyncio.create_task(run(step))
+        if tasks:
+            await asyncio.gather(*tasks.values())
+
+        # Steps caught in a dependency cycle never run
+        for step in workflow.steps:
+            if step.id not in tasks:
+                error_message = f"Skipping {step.name}: Dependencies not successfully met."
+                logger.warning(error_message)
+                self._skip_step(step, error_message)
+        logger.info("Finished asyncio parallel execution of workflow.")
+
+    @staticmethod
+    def _topological_order(steps: List[WorkflowStep]) -> List[WorkflowStep]:
+        """Order steps so each comes after its dependencies; steps in cycles are left out."""
+        step_ids = {step.id for step in steps}
+        remaining = {step.id: sum(1 for dep_id in step.dependencies if dep_id in step_ids) for step in steps}
+        dependents: Dict[str, List[WorkflowStep]] = {}
+        for step in steps:
+            for dep_id in step.dependencies:
+                dependents.setdefault(dep_id, []).append(step)
+        ordered = [step for step in steps if remaining[step.id] == 0]
+        for step in ordered:  # ordered grows while it is being walked
+            for dependent in dependents.get(step.id, ()):
+                remaining[dependent.id] -= 1
+                if remaining[dependent.id] == 0:
+                    ordered.append(dependent)
+        return ordered
+
+    def _start_step(self, step: WorkflowStep) -> Tuple[ExecutionResult, float]:
+        """Create the RUNNING result for a step and notify the callbacks.
+        
+        Returns the result and the perf_counter() start used to time the step.
+        """
+        started = time.perf_counter()
         result = ExecutionResult(
             step_id=step.id,
             status=StepStatus.RUNNING,
-            start_time=start_time.isoformat()
+            start_time=datetime.now().isoformat()
         )
         
         if self.status_callback:
@@ -346,38 +556,78 @@ class WorkflowRunner:
         # Notify animation system that step is running
         if self.animation_callback:
             self.animation_callback(step.id, "start")
+        return result, started
+
+    def _prepare_command(self, step: WorkflowStep, resolver: VariableResolver):
+        """Resolve the step's command and working directory, raising if it cannot run."""
+        resolved_command = resolver.resolve(step.command, step.id)
+        working_dir = resolver.resolve(step.working_directory, step.id) if step.working_directory else self.sandbox_dir
         
-        try:
-            resolved_command = resolver.resolve(step.command, step.id)
-            working_dir = resolver.resolve(step.working_directory, step.id) if step.working_directory else self.sandbox_dir
-            
-            unresolved = resolver.validate_variables(resolved_command)
-            if unresolved:
-                raise ValueError(f"Unresolved variables: {unresolved}")
-
-            # Check for command existence
-            if resolved_command and not self.dry_run:
-                command_name = resolved_command.split()[0]
-                if not shutil.which(command_name):
-                    raise FileNotFoundError(f"Command '{command_name}' not found in PATH.")
+        unresolved = resolver.validate_variables(resolved_command)
+        if unresolved:
+            raise ValueError(f"Unresolved variables: {unresolved}")
+
+        # Check for command existence
+        if resolved_command and not self.dry_run:
+            command_name = resolved_command.split()[0]
+            if not self._which(command_name):
+                raise FileNotFoundError(f"Command '{command_name}' not found in PATH.")
+        return resolved_command, working_dir
+
+    def _which(self, command_name: str) -> Optional[str]:
+        """shutil.which, remembering found commands until PATH changes"""
+        path = os.environ.get("PATH")
+        if path != self._which_path:
+            self._which_cache = {}
+            self._which_path = path
+        found = self._which_cache.get(command_name)
+        if found is None:
+            # Misses are not cached, so a tool installed mid-session is picked up
+            found = shutil.which(command_name)
+            if found is not None:
+                self._which_cache[command_name] = found
+        return found
+
+    @staticmethod
+    def _apply_process_result(result: ExecutionResult, process_result: Dict[str, Any]):
+        result.stdout = process_result['stdout']
+        result.stderr = process_result['stderr']
+        result.exit_code = process_result['exit_code']
+        result.status = StepStatus.SUCCESS if result.exit_code == 0 else StepStatus.FAILED
+
+    def _finish_step(self, step: WorkflowStep, result: ExecutionResult, started: float) -> ExecutionResult:
+        """Record timing for a finished step and notify the callbacks."""
+        # Time the step from the clock reading taken at its start rather than re-parsing start_time
+        result.execution_time = time.perf_counter() - started
+        result.end_time = datetime.now().isoformat()
+        
+        logger.info(f"Step {step.name} completed with status: {result.status}")
+        if self.status_callback:
+            self.status_callback(step.id, result.status, f"Step {step.name} completed with status: {result.status}")
+        
+        # Notify animation system that step has completed
+        if self.animation_callback:
+            self.animation_callback(step.id, "complete", result.status)
             
+        return result
+
+    def _execute_step(self, step: WorkflowStep, resolver: VariableResolver) -> ExecutionResult:
+        """Execute a single workflow step."""
+        result, started = self._start_step(step)
+        try:
+            resolved_command, working_dir = self._prepare_command(step, resolver)
             if self.dry_run:
                 result.status = StepStatus.SUCCESS
                 result.stdout = f"DRY RUN: Would execute: {resolved_command}"
                 logger.info(f"DRY RUN: {resolved_command}")
                 time.sleep(0.5) # Simulate work
             else:
-                process_result = self._run_command(
+                self._apply_process_result(result, self._run_command(
                     resolved_command, 
                     working_dir, 
                     step.timeout,
                     step.environment_vars
-                )
-                
-                result.stdout = process_result['stdout']
-                result.stderr = process_result['stderr']
-                result.exit_code = process_result['exit_code']
-                result.status = StepStatus.SUCCESS if result.exit_code == 0 else StepStatus.FAILED
+                ))
                 
         except subprocess.TimeoutExpired:
             result.status = StepStatus.TIMEOUT
@@ -386,49 +636,156 @@ class WorkflowRunner:
             result.status = StepStatus.FAILED
             result.error_message = str(e)
         
-        end_time = datetime.now()
-        result.end_time = end_time.isoformat()
-        result.execution_time = (end_time - start_time).total_seconds()
-        
-        logger.info(f"Step {step.name} completed with status: {result.status.value}")
-        if self.status_callback:
-            self.status_callback(step.id, result.status, f"Step {step.name} completed with status: {result.status.value}")
+        return self._finish_step(step, result, started)
+
+    async def _execute_step_async(self, step: WorkflowStep, resolver: VariableResolver) -> ExecutionResult:
+        """Execute a single workflow step without blocking the event loop."""
+        result, started = self._start_step(step)
+        try:
+            resolved_command, working_dir = self._prepare_command(step, resolver)
+            if self.dry_run:
+                result.status = StepStatus.SUCCESS
+                result.stdout = f"DRY RUN: Would execute: {resolved_command}"
+                logger.info(f"DRY RUN: {resolved_command}")
+                await asyncio.sleep(0.5) # Simulate work
+            else:
+                self._apply_process_result(result, await self._run_command_async(
+                    resolved_command,
+                    working_dir,
+                    step.timeout,
+                    step.environment_vars
+                ))
+        except Exception as e:
+            result.status = StepStatus.FAILED
+            result.error_message = str(e)
         
-        # Notify animation system that step has completed
-        if self.animation_callback:
-            self.animation_callback(step.id, "complete", result.status)
-            
-        return result
+        return self._finish_step(step, result, started)
+    
+    def _step_env(self, env_vars: Dict[str, str]) -> Dict[str, str]:
+        """The environment for a step: the run's environment snapshot plus the step's variables"""
+        base = self._base_env if self._base_env is not None else dict(os.environ)
+        return {**base, **env_vars} if env_vars else base
     
     def _run_command(self, command: str, working_dir: str, timeout: int, env_vars: Dict[str, str]) -> Dict[str, Any]:
-        """Run a command with proper isolation."""
-        env = os.environ.copy()
-        env.update(env_vars)
+        """Run a command with proper isolation.
+        
+        Output is read in chunks into byte buffers and decoded once the command is done.
+        """
+        env = self._step_env(env_vars)
         
         try:
-            process = subprocess.run(
-                command, shell=True, cwd=working_dir, env=env,
-                capture_output=True, text=True, timeout=timeout
-            )
-            return {'stdout': process.stdout, 'stderr': process.stderr, 'exit_code': process.returncode}
-        except subprocess.TimeoutExpired as e:
-            stdout = e.stdout.decode() if e.stdout else ""
-            stderr = e.stderr.decode() if e.stderr else ""
-            return {'stdout': stdout, 'stderr': stderr, 'exit_code': -1}
+            args, shell = _command_args(command)
+            # Limit how many steps fork and exec at once; running processes are not counted
+            with self._spawn_gate:
+                process = subprocess.Popen(
+                    args, shell=shell, cwd=working_dir, env=env,
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0
+                )
         except Exception as e:
             logger.error(f"Command execution failed: {e}")
             return {'stdout': '', 'stderr': str(e), 'exit_code': -1}
+        
+        if os.name == "nt":  # Pipes cannot be registered with a selector on Windows
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+                timed_out = False
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stdout, stderr = process.communicate()
+                timed_out = True
+        else:
+            stdout, stderr, timed_out = self._read_process_output(process, timeout)
+        return {'stdout': stdout.decode(errors="replace"), 'stderr': stderr.decode(errors="replace"),
+                'exit_code': -1 if timed_out else process.returncode}
     
-    def _get_dependency_statuses(self, dependencies: List[str]) -> List[StepStatus]:
-        """Get the statuses of all dependency steps."""
-        statuses = []
-        for dep_id in dependencies:
-            if dep_id in self.results:
-                statuses.append(self.results[dep_id].status)
-            else:
-                statuses.append(StepStatus.PENDING) # Dependency hasn't run yet
-        return statuses
-
+    @staticmethod
+    def _read_process_output(process: subprocess.Popen, timeout: int):
+        """Collect a process's stdout and stderr until both close, killing it at the timeout.
+        
+        Returns (stdout bytes, stderr bytes, whether it timed out).
+        """
+        buffers = {process.stdout: bytearray(), process.stderr: bytearray()}
+        deadline = time.monotonic() + timeout
+        timed_out = False
+        with selectors.DefaultSelector() as selector:
+            for pipe in buffers:
+                selector.register(pipe, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Keep what was read so far; children of a killed shell may hold the pipes open
+                    timed_out = True
+                    process.kill()
+                    break
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, READ_CHUNK)
+                    if chunk:
+                        buffers[key.fileobj] += chunk
+                    else:
+                        selector.unregister(key.fileobj)
+        for pipe in buffers:
+            pipe.close()
+        process.wait()
+        return buffers[process.stdout], buffers[process.stderr], timed_out
+    
+    async def _run_command_async(self, command: str, working_dir: str, timeout: int, env_vars: Dict[str, str]) -> Dict[str, Any]:
+        """Run a command as an asyncio subprocess; same result shape as _run_command.
+        
+        The process gets its own session, so a timeout kills the shell and everything it started.
+        """
+        env = self._step_env(env_vars)
+        
+        try:
+            args, shell = _command_args(command)
+            pipes = dict(cwd=working_dir, env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                         start_new_session=os.name != "nt")
+            # Share the sync path's launch gate; poll rather than block the loop
+            while not self._spawn_gate.acquire(blocking=False):
+                await asyncio.sleep(SPAWN_POLL_S)
+            try:
+                if shell:
+                    process = await asyncio.create_subprocess_shell(args, **pipes)
+                else:
+                    process = await asyncio.create_subprocess_exec(*args, **pipes)
+            finally:
+                self._spawn_gate.release()
+        except Exception as e:
+            logger.error(f"Command execution failed: {e}")
+            return {'stdout': '', 'stderr': str(e), 'exit_code': -1}
+        
+        buffers = (bytearray(), bytearray())
+        
+        async def collect(stream, buffer: bytearray):
+            while True:
+                chunk = await stream.read(READ_CHUNK)
+                if not chunk:
+                    return
+                buffer += chunk
+        
+        async def finish():
+            await asyncio.gather(collect(process.stdout, buffers[0]), collect(process.stderr, buffers[1]))
+            return await process.wait()
+        
+        try:
+            exit_code = await asyncio.wait_for(finish(), timeout)
+        except asyncio.TimeoutError:
+            # Keep what was read so far, as _run_command does
+            self._kill_process_tree(process)
+            await process.wait()
+            exit_code = -1
+        return {'stdout': buffers[0].decode(errors="replace"), 'stderr': buffers[1].decode(errors="replace"),
+                'exit_code': exit_code}
+    
+    @staticmethod
+    def _kill_process_tree(process):
+        """Kill a process started in its own session together with everything it spawned"""
+        if os.name == "nt":
+            process.kill()
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass  # Already gone
     
     def abort(self):
         """Abort current execution."""